@@ -1,9 +1,13 @@
 import os
+import math
 import requests
 import json
 from flask import Flask, render_template, request, jsonify, session
 from dotenv import load_dotenv
 import time
+from context_manager import ContextWindowManager
+from model_router import ModelRouter, TokenBucketLimiter
+from knowledge_base import KnowledgeBase
 
 # Load environment variables
 load_dotenv()
@@ -12,7 +16,7 @@ app = Flask(__name__)
 app.secret_key = os.urandom(24).hex()
 
 OPENROUTER_API_KEY = os.getenv('OPENROUTER_API_KEY', '')  
-OPENROUTER_API_URL = "https://openrouter.ai/api/v1/chat/completions"
+OPENROUTER_API_URL = os.getenv('OPENROUTER_API_URL', "https://openrouter.ai/api/v1/chat/completions")
 
 FREE_MODELS = [
     "google/gemini-2.0-flash:free",
@@ -22,28 +26,31 @@ FREE_MODELS = [
     "google/gemini-pro:free"
 ]
 
-class RateLimiter:
-    def __init__(self):
-        self.last_request_time = 0
-        self.min_interval = 2
-        self.rate_limit_reset = 0
-    
-    def can_make_request(self):
-        current_time = time.time()
-        if current_time < self.rate_limit_reset:
-            wait_time = self.rate_limit_reset - current_time
-            return False, wait_time
-        if current_time - self.last_request_time < self.min_interval:
-            return False, self.min_interval
-        return True, 0
-    
-    def record_request(self):
-        self.last_request_time = time.time()
-    
-    def set_rate_limit(self, reset_time):
-        self.rate_limit_reset = reset_time
+MAX_COMPLETION_TOKENS = 1000
+
+# Prompt token budgets per model (prompt + completion)
+MODEL_CONTEXT_BUDGETS = {
+    "google/gemini-2.0-flash:free": 8000,
+    "mistralai/mistral-7b-instruct:free": 4000,
+    "huggingfaceh4/zephyr-7b-beta:free": 2048,
+    "meta-llama/llama-3.1-8b-instruct:free": 8000,
+    "google/gemini-pro:free": 8000
+}
+
+context_manager = ContextWindowManager(
+    model_budgets=MODEL_CONTEXT_BUDGETS,
+    completion_reserve=MAX_COMPLETION_TOKENS,
+    history_limit=int(os.getenv('CONTEXT_HISTORY_TOKENS', 3000)),
+    summary_limit=int(os.getenv('CONTEXT_SUMMARY_TOKENS', 400))
+)
+
+# Each client may burst a few messages, then one every RATE_LIMIT_INTERVAL seconds
+rate_limiter = TokenBucketLimiter(
+    rate=1 / float(os.getenv('RATE_LIMIT_INTERVAL', 2)),
+    capacity=int(os.getenv('RATE_LIMIT_BURST', 5))
+)
 
-rate_limiter = RateLimiter()
+model_router = ModelRouter(FREE_MODELS)
 
 # Enhanced local knowledge base
 FALLBACK_KNOWLEDGE = {
@@ -64,6 +71,20 @@ FALLBACK_KNOWLEDGE = {
     'how are you': "I'm functioning well, thank you for asking! I'm here to help you with information and answers to your questions."
 }
 
+def load_knowledge_base():
+    """Index the knowledge base file if configured, otherwise the built-in entries"""
+    path = os.getenv('KNOWLEDGE_BASE_PATH')
+    if path:
+        try:
+            kb = KnowledgeBase.from_file(path)
+            print(f"Loaded {len(kb)} knowledge base entries from {path}")
+            return kb
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Knowledge base error: {e}")
+    return KnowledgeBase.from_dict(FALLBACK_KNOWLEDGE)
+
+knowledge_base = load_knowledge_base()
+
 def init_chat_history():
     if 'chat_history' not in session:
         session['chat_history'] = []
@@ -74,11 +95,9 @@ def init_chat_history():
 
 def get_fallback_response(query):
     """Get intelligent fallback response based on query"""
-    query_lower = query.lower()
-    
-    for keyword, response in FALLBACK_KNOWLEDGE.items():
-        if keyword in query_lower:
-            return response
+    response = knowledge_base.lookup(query)
+    if response:
+        return response
     
     return f"I understand you're asking about '{query}'. This seems like an interesting topic! While I have general knowledge about many subjects, for the most current or specific information, you might want to consult specialized resources or databases. Would you like me to share what I know about related topics?"
 
@@ -96,17 +115,33 @@ def openrouter_chat(messages, model_name=None):
         "model": model_name,
         "messages": messages,
         "temperature": 0.7,
-        "max_tokens": 1000
+        "max_tokens": MAX_COMPLETION_TOKENS
     }
     
+    started = time.monotonic()
     try:
         response = requests.post(OPENROUTER_API_URL, headers=headers, json=payload, timeout=30)
+        if response.status_code == 429:
+            model_router.record_failure(model_name, retry_after=parse_retry_after(response))
+            print(f"OpenRouter rate limited {model_name}")
+            return None
         response.raise_for_status()
         result = response.json()
-        return result['choices'][0]['message']['content']
+        content = result['choices'][0]['message']['content']
     except Exception as e:
+        model_router.record_failure(model_name)
         print(f"OpenRouter error: {e}")
         return None
+    
+    model_router.record_success(model_name, time.monotonic() - started)
+    return content
+
+def parse_retry_after(response, default=60):
+    """Seconds to back off after a 429 response"""
+    try:
+        return max(float(response.headers.get('Retry-After', default)), 1)
+    except ValueError:
+        return default
 
 @app.route('/')
 def home():
@@ -114,7 +149,7 @@ def home():
     status = {
         'ai_available': True,
         'service': 'OpenRouter (Free Models)',
-        'rate_limited': time.time() < rate_limiter.rate_limit_reset,
+        'rate_limited': model_router.all_open(),
         'models_available': len(FREE_MODELS)
     }
     return render_template('index.html', status=status)
@@ -129,32 +164,36 @@ def chat():
     session['chat_history'].append({"role": "user", "content": user_message})
     
     # Check rate limiting
-    can_request, wait_time = rate_limiter.can_make_request()
+    can_request, wait_time = rate_limiter.acquire(request.remote_addr)
     if not can_request:
-        fallback_response = f"Please wait {int(wait_time)} seconds before sending another message."
+        fallback_response = f"Please wait {math.ceil(wait_time)} seconds before sending another message."
         session['chat_history'].append({"role": "model", "content": fallback_response})
         session.modified = True
         return jsonify({
             'response': fallback_response,
             'used_search': False,
-            'rate_limited': True
+            'rate_limited': True,
+            'fallback': False
         })
     
-    rate_limiter.record_request()
-    
     try:
-        api_messages = []
-        for msg in session['chat_history']:
-            if msg['role'] == 'system':
-                api_messages.append({"role": "system", "content": msg['content']})
-            else:
-                api_messages.append({"role": msg['role'], "content": msg['content']})
+        history, summary = context_manager.compact(
+            session['chat_history'], session.get('chat_summary')
+        )
+        session['chat_history'] = history
+        session['chat_summary'] = summary
         
         response_text = None
-        for model_name in FREE_MODELS:
-            response_text = openrouter_chat(api_messages, model_name)
-            if response_text:
-                break
+        candidates, trial = model_router.ordered_models()
+        try:
+            for model_name in candidates:
+                api_messages = context_manager.build_messages(history, model_name, summary)
+                response_text = openrouter_chat(api_messages, model_name)
+                if response_text:
+                    break
+        finally:
+            if trial:
+                model_router.release(trial)
         
         if response_text:
             session['chat_history'].append({"role": "model", "content": response_text})
@@ -162,7 +201,8 @@ def chat():
             return jsonify({
                 'response': response_text,
                 'used_search': False,
-                'rate_limited': False
+                'rate_limited': False,
+                'fallback': False
             })
             
     except Exception as e:
@@ -175,12 +215,14 @@ def chat():
     return jsonify({
         'response': fallback_response,
         'used_search': False,
-        'rate_limited': False
+        'rate_limited': False,
+        'fallback': True
     })
 
 @app.route('/clear', methods=['POST'])
 def clear_chat():
     session['chat_history'] = []
+    session.pop('chat_summary', None)
     session['chat_history'].append({
         "role": "system", 
         "content": "You are a helpful, knowledgeable AI assistant. Provide accurate information and be conversational."
@@ -193,7 +235,8 @@ def status_check():
     return jsonify({
         'service': 'OpenRouter with Free Models',
         'models_available': len(FREE_MODELS),
-        'rate_limited': time.time() < rate_limiter.rate_limit_reset
+        'rate_limited': model_router.all_open(),
+        'models': model_router.snapshot()
     })
 
 @app.route('/models')
@@ -0,0 +1,112 @@
+import math
+
+# Rough characters-per-token ratio for English text across the free models
+CHARS_PER_TOKEN = 4
+# Per-message overhead for role markers and separators
+MESSAGE_OVERHEAD_TOKENS = 4
+
+DEFAULT_CONTEXT_BUDGET = 4096
+SUMMARY_PREFIX = "Summary of the earlier conversation:\n"
+
+
+def estimate_tokens(text):
+    """Cheap token estimate for a piece of text"""
+    if not text:
+        return MESSAGE_OVERHEAD_TOKENS
+    return math.ceil(len(text) / CHARS_PER_TOKEN) + MESSAGE_OVERHEAD_TOKENS
+
+
+def message_tokens(message):
+    """Token estimate for a chat message, cached on the message itself"""
+    tokens = message.get('tokens')
+    if tokens is None:
+        tokens = estimate_tokens(message.get('content', ''))
+        message['tokens'] = tokens
+    return tokens
+
+
+class ContextWindowManager:
+    """Keeps outgoing prompts within a per-model token budget"""
+
+    def __init__(self, model_budgets=None, default_budget=DEFAULT_CONTEXT_BUDGET,
+                 completion_reserve=1000, history_limit=3000, summary_limit=400):
+        self.model_budgets = model_budgets or {}
+        self.default_budget = default_budget
+        self.completion_reserve = completion_reserve
+        self.history_limit = history_limit
+        self.summary_limit = summary_limit
+
+    def budget_for(self, model_name):
+        """Prompt token budget for a model, leaving room for the completion"""
+        budget = self.model_budgets.get(model_name, self.default_budget)
+        return max(budget - self.completion_reserve, 0)
+
+    def build_messages(self, history, model_name, summary=None):
+        """Build the API payload: system prompt, summary and the most recent turns that fit"""
+        system_messages = [m for m in history if m['role'] == 'system']
+        turns = [m for m in history if m['role'] != 'system']
+
+        prefix = [{"role": "system", "content": m['content']} for m in system_messages]
+        used = sum(message_tokens(m) for m in system_messages)
+        if summary:
+            summary_content = SUMMARY_PREFIX + summary
+            prefix.append({"role": "system", "content": summary_content})
+            used += estimate_tokens(summary_content)
+
+        budget = self.budget_for(model_name)
+        selected = []
+        for message in reversed(turns):
+            tokens = message_tokens(message)
+            # Always send the latest turn, even if it alone exceeds the budget
+            if selected and used + tokens > budget:
+                break
+            selected.append({"role": message['role'], "content": message['content']})
+            used += tokens
+
+        selected.reverse()
+        return prefix + selected
+
+    def compact(self, history, summary=None):
+        """Collapse the oldest turns into the summary once history grows past its limit.
+
+        Returns the compacted history and the updated summary.
+        """
+        system_messages = [m for m in history if m['role'] == 'system']
+        turns = [m for m in history if m['role'] != 'system']
+
+        total = sum(message_tokens(m) for m in turns)
+        if total <= self.history_limit:
+            return history, summary
+
+        # Drop down to half the limit so compaction runs once per several turns
+        target = self.history_limit // 2
+        collapsed = []
+        while turns and total > target and len(turns) > 1:
+            message = turns.pop(0)
+            total -= message_tokens(message)
+            collapsed.append(message)
+
+        lines = summary.split('\n') if summary else []
+        lines.extend(self._summarize_message(m) for m in collapsed)
+        return system_messages + turns, self._trim_summary(lines)
+
+    def _summarize_message(self, message, max_chars=160):
+        """One-line extractive summary of a message"""
+        speaker = 'User' if message['role'] == 'user' else 'Assistant'
+        content = ' '.join(message.get('content', '').split())
+        if len(content) > max_chars:
+            content = content[:max_chars].rsplit(' ', 1)[0] + '...'
+        return f"{speaker}: {content}"
+
+    def _trim_summary(self, lines):
+        """Keep the newest summary lines that fit the summary budget"""
+        kept = []
+        used = 0
+        for line in reversed(lines):
+            tokens = estimate_tokens(line)
+            if used + tokens > self.summary_limit:
+                break
+            kept.append(line)
+            used += tokens
+        kept.reverse()
+        return '\n'.join(kept)
@@ -0,0 +1,185 @@
+import json
+import math
+import re
+from collections import Counter, deque
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+STOP_WORDS = frozenset([
+    'a', 'an', 'and', 'are', 'about', 'can', 'do', 'does', 'for', 'how', 'i', 'in', 'is',
+    'it', 'me', 'my', 'of', 'on', 'or', 'the', 'to', 'what', 'whats', 'you', 'your'
+])
+
+
+def tokenize(text):
+    return [t for t in TOKEN_PATTERN.findall(text.lower()) if t not in STOP_WORDS]
+
+
+def _is_word_char(ch):
+    return ch.isalnum()
+
+
+class KeywordAutomaton:
+    """Aho-Corasick automaton matching whole-word keywords in a single pass"""
+
+    def __init__(self):
+        self.transitions = [{}]
+        self.fail = [0]
+        self.outputs = [[]]
+
+    def add(self, keyword, value):
+        state = 0
+        for ch in keyword:
+            next_state = self.transitions[state].get(ch)
+            if next_state is None:
+                next_state = len(self.transitions)
+                self.transitions.append({})
+                self.fail.append(0)
+                self.outputs.append([])
+                self.transitions[state][ch] = next_state
+            state = next_state
+        self.outputs[state].append((len(keyword), value))
+
+    def build(self):
+        """Compute failure links breadth-first"""
+        queue = deque(self.transitions[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, next_state in self.transitions[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and ch not in self.transitions[fallback]:
+                    fallback = self.fail[fallback]
+                target = self.transitions[fallback].get(ch, 0)
+                self.fail[next_state] = target if target != next_state else 0
+                self.outputs[next_state] = self.outputs[next_state] + self.outputs[self.fail[next_state]]
+
+    def search(self, text):
+        """Yield (keyword_length, value) for every whole-word keyword found in text.
+
+        A trailing plural 's' is accepted so 'thank' also matches 'thanks'.
+        """
+        state = 0
+        length = len(text)
+        for end, ch in enumerate(text):
+            while state and ch not in self.transitions[state]:
+                state = self.fail[state]
+            state = self.transitions[state].get(ch, 0)
+            for size, value in self.outputs[state]:
+                start = end - size + 1
+                if start > 0 and _is_word_char(text[start - 1]):
+                    continue
+                after = end + 1
+                if after < length and _is_word_char(text[after]):
+                    if text[after] != 's' or (after + 1 < length and _is_word_char(text[after + 1])):
+                        continue
+                yield size, value
+
+
+class KnowledgeBase:
+    """Keyword automaton plus a BM25 index for ranking fallback answers"""
+
+    def __init__(self, entries, k1=1.5, b=0.75, keyword_weight=0.5, max_df_ratio=0.05, min_score=1.0):
+        self.k1 = k1
+        self.b = b
+        self.keyword_weight = keyword_weight
+        self.min_score = min_score
+        self.answers = []
+        self.automaton = KeywordAutomaton()
+
+        term_freqs = []
+        doc_freqs = Counter()
+        for keywords, answer in entries:
+            doc_id = len(self.answers)
+            self.answers.append(answer)
+            for keyword in keywords:
+                keyword = ' '.join(keyword.lower().split())
+                if keyword:
+                    self.automaton.add(keyword, doc_id)
+            terms = Counter(tokenize(' '.join(keywords) + ' ' + answer))
+            term_freqs.append(terms)
+            doc_freqs.update(terms.keys())
+
+        self.automaton.build()
+        self._build_index(term_freqs, doc_freqs)
+        # Very common terms are too expensive to expand and carry little signal
+        self.max_df = max(1, int(len(self.answers) * max_df_ratio))
+
+    def _build_index(self, term_freqs, doc_freqs):
+        """Precompute per-(term, document) BM25 weights so scoring is just addition"""
+        doc_count = len(term_freqs)
+        lengths = [sum(terms.values()) for terms in term_freqs]
+        avg_length = sum(lengths) / doc_count if doc_count else 0
+        idf = {
+            term: math.log(1 + (doc_count - df + 0.5) / (df + 0.5))
+            for term, df in doc_freqs.items()
+        }
+        self.doc_weights = []
+        self.postings = {}
+        for doc_id, terms in enumerate(term_freqs):
+            norm = self.k1 * (1 - self.b + self.b * lengths[doc_id] / avg_length)
+            weights = {
+                term: idf[term] * tf * (self.k1 + 1) / (tf + norm)
+                for term, tf in terms.items()
+            }
+            self.doc_weights.append(weights)
+            for term, weight in weights.items():
+                self.postings.setdefault(term, []).append((doc_id, weight))
+
+    @classmethod
+    def from_dict(cls, knowledge, **kwargs):
+        """Build from a {keyword: answer} mapping"""
+        return cls([([keyword], answer) for keyword, answer in knowledge.items()], **kwargs)
+
+    @classmethod
+    def from_file(cls, path, **kwargs):
+        """Load entries from a .json or .jsonl file.
+
+        Each entry is {"keywords": [...], "answer": "..."}; a JSON object mapping
+        keyword to answer is also accepted.
+        """
+        with open(path, encoding='utf-8') as f:
+            if path.endswith('.jsonl'):
+                records = [json.loads(line) for line in f if line.strip()]
+            else:
+                records = json.load(f)
+        if isinstance(records, dict):
+            return cls.from_dict(records, **kwargs)
+        return cls([(r['keywords'], r['answer']) for r in records], **kwargs)
+
+    def __len__(self):
+        return len(self.answers)
+
+    def lookup(self, query):
+        """Best answer for a query, or None when nothing relevant is indexed"""
+        query_lower = ' '.join(query.lower().split())
+        query_terms = tokenize(query_lower)
+
+        keyword_hits = {}
+        for size, doc_id in self.automaton.search(query_lower):
+            keyword_hits[doc_id] = max(keyword_hits.get(doc_id, 0), size)
+
+        if keyword_hits:
+            best = max(
+                keyword_hits,
+                key=lambda d: (self._bm25(query_terms, d) + self.keyword_weight * keyword_hits[d], -d)
+            )
+            return self.answers[best]
+
+        scores = {}
+        for term in set(query_terms):
+            postings = self.postings.get(term)
+            if postings and len(postings) <= self.max_df:
+                for doc_id, weight in postings:
+                    scores[doc_id] = scores.get(doc_id, 0.0) + weight
+        if not scores:
+            return None
+
+        best = max(scores, key=lambda d: (scores[d], -d))
+        if scores[best] < self.min_score:
+            return None
+        return self.answers[best]
+
+    def _bm25(self, query_terms, doc_id):
+        weights = self.doc_weights[doc_id]
+        return sum(weights.get(term, 0.0) for term in set(query_terms))
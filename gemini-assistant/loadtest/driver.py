@@ -0,0 +1,112 @@
+"""Replay multi-turn conversations against the assistant's /chat endpoint.
+
+Reports throughput, latency percentiles and the fallback rate.
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import requests
+
+SAMPLE_CONVERSATIONS = [
+    ["Hello!", "What is machine learning?", "How is it different from AI?", "Thanks!"],
+    ["Tell me about Python", "What is Flask used for?", "How do I build an API with it?"],
+    ["What is blockchain?", "How does bitcoin use it?", "What about ethereum prices?", "Thank you"],
+    ["How are you?", "Can you help me plan a study schedule?", "Make it two weeks long",
+     "Add weekends off", "Summarize the plan"],
+]
+
+
+class Results:
+    """Thread-safe collector for per-request outcomes"""
+
+    def __init__(self):
+        self.latencies = []
+        self.fallbacks = 0
+        self.rate_limited = 0
+        self.errors = 0
+        self.lock = threading.Lock()
+
+    def record(self, latency, data=None, error=False):
+        with self.lock:
+            self.latencies.append(latency)
+            if error:
+                self.errors += 1
+                return
+            if data.get('fallback'):
+                self.fallbacks += 1
+            if data.get('rate_limited'):
+                self.rate_limited += 1
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0
+    index = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def run_conversation(base_url, turns, results, think_time):
+    """Play one conversation in its own cookie session"""
+    with requests.Session() as http:
+        for message in turns:
+            started = time.perf_counter()
+            try:
+                response = http.post(f"{base_url}/chat", json={'message': message}, timeout=120)
+                response.raise_for_status()
+                results.record(time.perf_counter() - started, response.json())
+            except (requests.RequestException, ValueError):
+                results.record(time.perf_counter() - started, error=True)
+            if think_time:
+                time.sleep(random.uniform(0, think_time))
+
+
+def load_conversations(path):
+    """Conversations from a JSON file: a list of lists of user messages"""
+    if not path:
+        return SAMPLE_CONVERSATIONS
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def report(results, elapsed):
+    latencies = sorted(results.latencies)
+    total = len(latencies)
+    print(f"Requests:      {total}")
+    print(f"Elapsed:       {elapsed:.2f}s")
+    print(f"Throughput:    {total / elapsed if elapsed else 0:.2f} req/s")
+    for pct in (50, 95, 99):
+        print(f"p{pct} latency:   {percentile(latencies, pct) * 1000:.1f} ms")
+    if total:
+        print(f"Fallback rate: {results.fallbacks / total:.1%}")
+        print(f"Rate limited:  {results.rate_limited / total:.1%}")
+        print(f"Errors:        {results.errors / total:.1%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--url', default='http://127.0.0.1:5000', help='assistant base URL')
+    parser.add_argument('--concurrency', type=int, default=10, help='conversations in flight at once')
+    parser.add_argument('--conversations', type=int, default=100, help='total conversations to replay')
+    parser.add_argument('--file', help='JSON file with a list of conversations (lists of messages)')
+    parser.add_argument('--think-time', type=float, default=0.0, help='max random pause between turns')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    conversations = load_conversations(args.file)
+    results = Results()
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        for i in range(args.conversations):
+            turns = conversations[i % len(conversations)]
+            pool.submit(run_conversation, args.url.rstrip('/'), turns, results, args.think_time)
+    report(results, time.perf_counter() - started)
+
+
+if __name__ == '__main__':
+    main()
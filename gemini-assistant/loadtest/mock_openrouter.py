@@ -0,0 +1,127 @@
+"""Local stand-in for the OpenRouter chat-completions API.
+
+Run it, then start the assistant with
+OPENROUTER_API_URL=http://127.0.0.1:5001/api/v1/chat/completions
+"""
+import argparse
+import json
+import random
+import threading
+import time
+import uuid
+from flask import Flask, Response, request, jsonify
+
+app = Flask(__name__)
+
+settings = {
+    'latency': 0.5,
+    'jitter': 0.2,
+    'error_rate': 0.0,
+    'rate_limit_rate': 0.0,
+    'retry_after': 5,
+    'failing_models': set(),
+    'chunk_delay': 0.02
+}
+
+stats = {'requests': 0, 'errors': 0, 'rate_limited': 0, 'streamed': 0}
+stats_lock = threading.Lock()
+
+
+def count(key):
+    with stats_lock:
+        stats[key] += 1
+
+
+def build_reply(messages):
+    """Deterministic reply echoing the last user message"""
+    last_user = next((m['content'] for m in reversed(messages) if m.get('role') == 'user'), '')
+    prompt_chars = sum(len(m.get('content', '')) for m in messages)
+    return f"Mock answer to '{last_user[:80]}' (prompt of {len(messages)} messages, {prompt_chars} chars)."
+
+
+def stream_reply(model, reply):
+    """Server-sent events in the OpenAI/OpenRouter streaming format"""
+    completion_id = f"gen-{uuid.uuid4().hex}"
+    for word in reply.split(' '):
+        chunk = {
+            'id': completion_id,
+            'model': model,
+            'choices': [{'index': 0, 'delta': {'content': word + ' '}, 'finish_reason': None}]
+        }
+        yield f"data: {json.dumps(chunk)}\n\n"
+        time.sleep(settings['chunk_delay'])
+    done = {'id': completion_id, 'model': model, 'choices': [{'index': 0, 'delta': {}, 'finish_reason': 'stop'}]}
+    yield f"data: {json.dumps(done)}\n\n"
+    yield "data: [DONE]\n\n"
+
+
+@app.route('/api/v1/chat/completions', methods=['POST'])
+def chat_completions():
+    count('requests')
+    payload = request.get_json(force=True)
+    model = payload.get('model', '')
+    messages = payload.get('messages', [])
+
+    time.sleep(max(0, random.gauss(settings['latency'], settings['jitter'])))
+
+    if random.random() < settings['rate_limit_rate']:
+        count('rate_limited')
+        response = jsonify({'error': {'code': 429, 'message': 'Rate limit exceeded'}})
+        response.status_code = 429
+        response.headers['Retry-After'] = str(settings['retry_after'])
+        return response
+
+    if model in settings['failing_models'] or random.random() < settings['error_rate']:
+        count('errors')
+        return jsonify({'error': {'code': 502, 'message': 'Upstream model error'}}), 502
+
+    reply = build_reply(messages)
+    if payload.get('stream'):
+        count('streamed')
+        return Response(stream_reply(model, reply), mimetype='text/event-stream')
+
+    prompt_tokens = sum(len(m.get('content', '')) for m in messages) // 4
+    return jsonify({
+        'id': f"gen-{uuid.uuid4().hex}",
+        'model': model,
+        'choices': [{'index': 0, 'message': {'role': 'assistant', 'content': reply}, 'finish_reason': 'stop'}],
+        'usage': {
+            'prompt_tokens': prompt_tokens,
+            'completion_tokens': len(reply) // 4,
+            'total_tokens': prompt_tokens + len(reply) // 4
+        }
+    })
+
+
+@app.route('/stats')
+def get_stats():
+    with stats_lock:
+        return jsonify(dict(stats))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--port', type=int, default=5001)
+    parser.add_argument('--latency', type=float, default=0.5, help='mean response latency in seconds')
+    parser.add_argument('--jitter', type=float, default=0.2, help='latency standard deviation in seconds')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='fraction of requests answered with 502')
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0, help='fraction of requests answered with 429')
+    parser.add_argument('--retry-after', type=int, default=5, help='Retry-After seconds sent with 429s')
+    parser.add_argument('--failing-model', action='append', default=[], help='model that always fails')
+    parser.add_argument('--chunk-delay', type=float, default=0.02, help='delay between streamed chunks')
+    args = parser.parse_args()
+
+    settings.update(
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        retry_after=args.retry_after,
+        failing_models=set(args.failing_model),
+        chunk_delay=args.chunk_delay
+    )
+    app.run(host='127.0.0.1', port=args.port, threaded=True)
+
+
+if __name__ == '__main__':
+    main()
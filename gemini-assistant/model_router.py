@@ -0,0 +1,176 @@
+import threading
+import time
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class TokenBucketLimiter:
+    """Per-client token bucket rate limiting"""
+
+    def __init__(self, rate=0.5, capacity=5, max_clients=10000):
+        self.rate = rate
+        self.capacity = capacity
+        self.max_clients = max_clients
+        self.buckets = {}
+        self.lock = threading.Lock()
+
+    def acquire(self, client_id):
+        """Take a token for a client. Returns (allowed, seconds_to_wait)"""
+        now = time.monotonic()
+        with self.lock:
+            tokens, last = self.buckets.get(client_id, (self.capacity, now))
+            tokens = min(self.capacity, tokens + (now - last) * self.rate)
+            if tokens >= 1:
+                self.buckets[client_id] = (tokens - 1, now)
+                allowed, wait_time = True, 0
+            else:
+                self.buckets[client_id] = (tokens, now)
+                allowed, wait_time = False, (1 - tokens) / self.rate
+            if len(self.buckets) > self.max_clients:
+                self._prune(now)
+        return allowed, wait_time
+
+    def _prune(self, now):
+        """Forget clients whose buckets have refilled; a full bucket is the default state"""
+        refill_time = self.capacity / self.rate
+        self.buckets = {
+            client_id: (tokens, last)
+            for client_id, (tokens, last) in self.buckets.items()
+            if now - last < refill_time
+        }
+
+
+class ModelHealth:
+    """EWMA latency/error tracking and circuit breaker state for one model"""
+
+    def __init__(self, name, priority):
+        self.name = name
+        self.priority = priority
+        self.latency = None
+        self.error_rate = 0.0
+        self.samples = 0
+        self.consecutive_failures = 0
+        self.state = CLOSED
+        self.opened_at = 0
+        self.cooldown = 0
+        self.trial_in_progress = False
+
+    def to_dict(self):
+        return {
+            'model': self.name,
+            'state': self.state,
+            'latency_ms': round(self.latency * 1000) if self.latency is not None else None,
+            'error_rate': round(self.error_rate, 3)
+        }
+
+
+class ModelRouter:
+    """Routes requests to the fastest healthy model and trips breakers on failing ones.
+
+    A breaker opens after `failure_threshold` consecutive failures, or once a
+    model has at least `min_samples` results and its error-rate EWMA reaches
+    `error_rate_threshold`. The sample floor keeps the EWMA from tripping on a
+    couple of early failures before the consecutive-failure rule applies.
+    """
+
+    def __init__(self, models, alpha=0.3, failure_threshold=3, error_rate_threshold=0.5,
+                 min_samples=10, base_cooldown=30, max_cooldown=300):
+        self.alpha = alpha
+        self.failure_threshold = failure_threshold
+        self.error_rate_threshold = error_rate_threshold
+        self.min_samples = min_samples
+        self.base_cooldown = base_cooldown
+        self.max_cooldown = max_cooldown
+        self.health = {name: ModelHealth(name, i) for i, name in enumerate(models)}
+        self.lock = threading.Lock()
+
+    def ordered_models(self):
+        """Models to try in order and the half-open trial claimed by this caller, if any.
+
+        A model due a half-open trial goes first so its single trial is a real
+        request; healthy models follow, ordered by EWMA latency. The caller must
+        release() the trial once the request is done.
+        """
+        now = time.monotonic()
+        healthy = []
+        trial = None
+        with self.lock:
+            for health in self.health.values():
+                if health.state == OPEN and now - health.opened_at >= health.cooldown:
+                    health.state = HALF_OPEN
+                if health.state == CLOSED:
+                    healthy.append(health)
+                elif health.state == HALF_OPEN and not health.trial_in_progress and trial is None:
+                    health.trial_in_progress = True
+                    trial = health
+        # Untried models sort first so each one gets a latency sample
+        healthy.sort(key=lambda h: (h.latency or 0, h.priority))
+        models = [h.name for h in healthy]
+        if trial is not None:
+            return [trial.name] + models, trial.name
+        return models, None
+
+    def record_success(self, model_name, latency):
+        """Update stats after a successful call"""
+        with self.lock:
+            health = self.health[model_name]
+            if health.latency is None:
+                health.latency = latency
+            else:
+                health.latency = self.alpha * latency + (1 - self.alpha) * health.latency
+            health.error_rate = (1 - self.alpha) * health.error_rate
+            health.samples += 1
+            health.consecutive_failures = 0
+            health.trial_in_progress = False
+            health.state = CLOSED
+            health.cooldown = 0
+
+    def record_failure(self, model_name, retry_after=None):
+        """Update stats after a failed call, opening the breaker when needed"""
+        with self.lock:
+            health = self.health[model_name]
+            health.error_rate = self.alpha + (1 - self.alpha) * health.error_rate
+            health.samples += 1
+            health.consecutive_failures += 1
+            error_rate_tripped = (
+                health.samples >= self.min_samples and health.error_rate >= self.error_rate_threshold
+            )
+            if health.state == OPEN:
+                # A call that was already in flight when the breaker opened
+                pass
+            elif (health.state == HALF_OPEN or retry_after is not None
+                    or health.consecutive_failures >= self.failure_threshold
+                    or error_rate_tripped):
+                self._open(health, retry_after)
+            health.trial_in_progress = False
+
+    def release(self, model_name):
+        """Hand back a half-open trial slot; a no-op once the trial's outcome is recorded"""
+        with self.lock:
+            self.health[model_name].trial_in_progress = False
+
+    def _open(self, health, retry_after=None):
+        if retry_after is not None:
+            cooldown = retry_after
+        elif health.cooldown:
+            cooldown = min(health.cooldown * 2, self.max_cooldown)
+        else:
+            cooldown = self.base_cooldown
+        health.state = OPEN
+        health.opened_at = time.monotonic()
+        health.cooldown = cooldown
+
+    def all_open(self):
+        """True when every model's breaker is open and still cooling down"""
+        now = time.monotonic()
+        with self.lock:
+            return all(
+                h.state == OPEN and now - h.opened_at < h.cooldown
+                for h in self.health.values()
+            )
+
+    def snapshot(self):
+        with self.lock:
+            return [h.to_dict() for h in self.health.values()]
@@ -0,0 +1,58 @@
+"""Breaker thresholds and half-open trials of ModelRouter.
+
+Run from gemini-assistant/: python -m pytest tests
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from model_router import CLOSED, OPEN, ModelRouter
+
+
+def test_consecutive_failures_trip_before_error_rate():
+    router = ModelRouter(['fast'])
+
+    router.record_failure('fast')
+    router.record_failure('fast')
+    # The error-rate EWMA is already above 0.5 here, but too few samples to count
+    assert router.health['fast'].error_rate >= router.error_rate_threshold
+    assert router.health['fast'].state == CLOSED
+
+    router.record_failure('fast')
+    assert router.health['fast'].state == OPEN
+
+
+def test_error_rate_trips_intermittently_failing_model():
+    router = ModelRouter(['flaky'])
+    opened_after = None
+    for call in range(1, 31):
+        # Two failures then a success never reaches three in a row
+        if call % 3 == 1:
+            router.record_success('flaky', 0.1)
+        else:
+            router.record_failure('flaky')
+        if router.health['flaky'].state == OPEN:
+            opened_after = call
+            break
+
+    assert router.health['flaky'].consecutive_failures < router.failure_threshold
+    assert opened_after is not None and opened_after >= router.min_samples
+
+
+def test_half_open_model_gets_a_real_trial_and_recovers():
+    router = ModelRouter(['slow', 'fast'], base_cooldown=0)
+    router.record_success('slow', 2.0)
+    for _ in range(3):
+        router.record_failure('fast')
+
+    models, trial = router.ordered_models()
+    assert trial == 'fast'
+    assert models == ['fast', 'slow']
+
+    # Only one caller gets the trial while it is in flight
+    assert router.ordered_models() == (['slow'], None)
+
+    router.record_success('fast', 0.1)
+    router.release(trial)
+    assert router.ordered_models() == (['fast', 'slow'], None)
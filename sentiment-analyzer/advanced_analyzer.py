@@ -4,16 +4,17 @@ import nltk
 from nltk.tokenize import word_tokenize, sent_tokenize
 from nltk.corpus import stopwords
 from collections import Counter
-import re
-import string
 import pandas as pd
 import numpy as np
 from datetime import datetime
+from text_normalizer import normalize_text
+from lexicon_scorer import CompactLexiconScorer
 
 class AdvancedSentimentAnalyzer:
     def __init__(self):
         self._download_nltk_data()
         self.sia = SentimentIntensityAnalyzer()
+        self.compound_scorer = CompactLexiconScorer(self.sia.lexicon)
         self.stop_words = set(stopwords.words('english'))
         
         self.emotion_lexicon = {
@@ -73,6 +74,10 @@ class AdvancedSentimentAnalyzer:
         
         return result
     
+    def compound_scores(self, texts):
+        """Fast batch VADER compound scores for feeds that only need the compound value"""
+        return self.compound_scorer.compound_scores(texts).tolist()
+    
     def _advanced_analysis(self, text):
         """Perform advanced text analysis"""
         emotions = self._analyze_emotions(text)
@@ -115,11 +120,7 @@ class AdvancedSentimentAnalyzer:
     
     def _clean_text(self, text):
         """Clean and preprocess text"""
-        text = re.sub(r'http\S+|www\S+|https\S+', '', text, flags=re.MULTILINE)
-        text = re.sub(r'@\w+|#\w+', '', text)
-        text = re.sub(r'\s+', ' ', text).strip()
-        text = text.translate(str.maketrans('', '', string.punctuation))
-        return text.lower()
+        return normalize_text(text)
     
     def _get_sentiment_label(self, score):
         """Convert score to sentiment label"""
@@ -0,0 +1,66 @@
+"""Benchmark text_normalizer against the previous _clean_text and check the outputs match.
+
+Run from sentiment-analyzer/: python benchmarks/bench_clean_text.py
+"""
+import os
+import random
+import re
+import string
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from text_normalizer import normalize_text, normalize_texts
+
+SHORT = "Loving the new phone!!! @apple #tech http://t.co/xyz so good :)"
+SHORT_PLAIN = "Loving the new phone, it is so good :)"
+LONG = " ".join(["This product is GREAT, honestly; I'd buy it again. @shop #deal https://ex.com/p?id=1 really!"] * 20)
+LONG_PLAIN = " ".join(["This product is GREAT, honestly; I'd buy it again and again, really!"] * 20)
+
+FRAGMENTS = ['a', 'B', 'http', 'www', 'https://x.co/a?b=1', '@', '#', 'u', '  ', '\n', ' ', '!', ',', '.',
+             "'", '-', '_', 'é', '1', 'www.x', 'HTTP://Y', '\t', ' ', 'İ', 'ß', 'Σ']
+
+
+def legacy_clean_text(text):
+    """The original AdvancedSentimentAnalyzer._clean_text"""
+    text = re.sub(r'http\S+|www\S+|https\S+', '', text, flags=re.MULTILINE)
+    text = re.sub(r'@\w+|#\w+', '', text)
+    text = re.sub(r'\s+', ' ', text).strip()
+    text = text.translate(str.maketrans('', '', string.punctuation))
+    return text.lower()
+
+
+def check_equivalence(samples=200000, seed=0):
+    rng = random.Random(seed)
+    corpus = [SHORT, SHORT_PLAIN, LONG, LONG_PLAIN, '', '   ']
+    corpus += [''.join(rng.choice(FRAGMENTS) for _ in range(rng.randint(0, 16))) for _ in range(samples)]
+    expected = [legacy_clean_text(text) for text in corpus]
+    for text, want in zip(corpus, expected):
+        got = normalize_text(text)
+        assert got == want, f"normalize_text({text!r}) = {got!r}, expected {want!r}"
+    assert normalize_texts(corpus) == expected, "normalize_texts output differs"
+    print(f"Outputs match on {len(corpus)} inputs")
+
+
+def per_call_us(func, arg, number):
+    return timeit.timeit(lambda: func(arg), number=number) / number * 1e6
+
+
+def main():
+    check_equivalence()
+    print(f"{'input':>12} {'legacy us':>10} {'fused us':>10} {'speedup':>8}")
+    for name, text in [('short', SHORT), ('short plain', SHORT_PLAIN), ('long', LONG), ('long plain', LONG_PLAIN)]:
+        number = 20000 if name.startswith('short') else 2000
+        legacy = per_call_us(legacy_clean_text, text, number)
+        fused = per_call_us(normalize_text, text, number)
+        print(f"{name:>12} {legacy:>10.2f} {fused:>10.2f} {legacy / fused:>7.1f}x")
+
+    batch = [SHORT, SHORT_PLAIN] * 500
+    legacy = timeit.timeit(lambda: [legacy_clean_text(t) for t in batch], number=20) / 20 / len(batch) * 1e6
+    fused = timeit.timeit(lambda: normalize_texts(batch), number=20) / 20 / len(batch) * 1e6
+    print(f"{'batch x1000':>12} {legacy:>10.2f} {fused:>10.2f} {legacy / fused:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+"""Throughput of CompactLexiconScorer against VADER's polarity_scores.
+
+Uses the seeded corpus from tests/test_lexicon_scorer.py, where the accuracy
+tolerance is documented and enforced; the difference is printed here too.
+
+Run from sentiment-analyzer/: python benchmarks/bench_vader_fastpath.py
+"""
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'tests'))
+
+from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+from lexicon_scorer import CompactLexiconScorer
+from test_lexicon_scorer import build_corpus, label
+
+
+def main():
+    sia = SentimentIntensityAnalyzer()
+    scorer = CompactLexiconScorer(sia.lexicon)
+    corpus = build_corpus(sia.lexicon)
+
+    started = time.perf_counter()
+    reference = [sia.polarity_scores(text)['compound'] for text in corpus]
+    per_call = time.perf_counter() - started
+
+    started = time.perf_counter()
+    fast = scorer.compound_scores(corpus)
+    raw_batch = time.perf_counter() - started
+
+    tokenized = [scorer.tokenize(text) for text in corpus]
+    encoded = [scorer.encode(tokens) for tokens in tokenized]
+    caps = [scorer.caps_mask(tokens) for tokens in tokenized]
+    exclamations = [text.count('!') for text in corpus]
+    questions = [text.count('?') for text in corpus]
+    started = time.perf_counter()
+    scorer.compound_batch(encoded, exclamations, questions, caps)
+    encoded_batch = time.perf_counter() - started
+
+    errors = [abs(a - b) for a, b in zip(reference, fast)]
+    agreement = sum(label(a) == label(b) for a, b in zip(reference, fast)) / len(corpus)
+
+    count = len(corpus)
+    print(f"Texts:                    {count}")
+    print(f"polarity_scores per call: {count / per_call:>10.0f} texts/s")
+    print(f"compound_scores (raw):    {count / raw_batch:>10.0f} texts/s ({per_call / raw_batch:.1f}x)")
+    print(f"compound_batch (encoded): {count / encoded_batch:>10.0f} texts/s ({per_call / encoded_batch:.1f}x)")
+    print(f"Mean abs difference:      {sum(errors) / count:.4f} (max {max(errors):.4f})")
+    print(f"Label agreement:          {agreement:.2%}")
+
+
+if __name__ == '__main__':
+    main()
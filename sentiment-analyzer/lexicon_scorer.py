@@ -0,0 +1,192 @@
+import string
+import numpy as np
+from vaderSentiment.vaderSentiment import BOOSTER_DICT, NEGATE, N_SCALAR, C_INCR
+
+
+class CompactLexiconScorer:
+    """Batch VADER compound scoring over integer token IDs and NumPy valence arrays.
+
+    Applies the lexicon valences, booster/dampener words and negation over the
+    three preceding tokens (with the 'never so' and 'without doubt' exceptions),
+    the 'no' and 'least' negations, ALL-CAPS emphasis, the contrastive 'but'
+    rule and !/? emphasis. 'kind' followed by 'of' is not scored as the lexicon
+    word 'kind', but the 'kind of' dampener itself is one of VADER's special
+    idioms, which are skipped along with emoji descriptions. Scores can
+    therefore differ slightly from SentimentIntensityAnalyzer.polarity_scores;
+    tests/test_lexicon_scorer.py checks the documented tolerance.
+    """
+
+    UNKNOWN_ID = 0
+    UNKNOWN_NEGATION_ID = 1
+
+    def __init__(self, lexicon):
+        words = set(lexicon) | set(BOOSTER_DICT) | set(NEGATE)
+        words |= {'but', 'kind', 'of', 'never', 'so', 'this', 'without', 'doubt',
+                  'no', 'or', 'nor', 'least', 'at', 'very'}
+        self.vocab = {word: i for i, word in enumerate(sorted(words), start=2)}
+        size = len(self.vocab) + 2
+
+        self.valence = np.zeros(size)
+        self.in_lexicon = np.zeros(size, dtype=bool)
+        self.scored = np.zeros(size, dtype=bool)
+        self.booster = np.zeros(size)
+        self.negation = np.zeros(size, dtype=bool)
+        self.negation[self.UNKNOWN_NEGATION_ID] = True
+        self.but_id = self.vocab['but']
+        self.kind_id = self.vocab['kind']
+        self.of_id = self.vocab['of']
+        self.never_id = self.vocab['never']
+        self.without_id = self.vocab['without']
+        self.doubt_id = self.vocab['doubt']
+        self.so_this_ids = np.array([self.vocab['so'], self.vocab['this']])
+        self.no_id = self.vocab['no']
+        self.or_nor_ids = np.array([self.vocab['or'], self.vocab['nor']])
+        self.least_id = self.vocab['least']
+        self.at_very_ids = np.array([self.vocab['at'], self.vocab['very']])
+
+        for word, i in self.vocab.items():
+            if word in lexicon:
+                self.in_lexicon[i] = True
+                # Boosters score 0 themselves even when they are lexicon words
+                if word not in BOOSTER_DICT:
+                    self.valence[i] = lexicon[word]
+                    self.scored[i] = True
+            self.booster[i] = BOOSTER_DICT.get(word, 0.0)
+            self.negation[i] = word in NEGATE or "n't" in word
+
+    @staticmethod
+    def tokenize(text):
+        """VADER's tokenization: split on whitespace, strip punctuation unless it leaves <= 2 chars"""
+        tokens = []
+        for token in text.split():
+            stripped = token.strip(string.punctuation)
+            tokens.append(stripped if len(stripped) > 2 else token)
+        return tokens
+
+    def encode(self, tokens):
+        """Map tokens to an int32 ID array; feeds can cache the result"""
+        vocab = self.vocab
+        ids = []
+        for token in tokens:
+            token = token.lower()
+            ids.append(vocab.get(token, self.UNKNOWN_NEGATION_ID if "n't" in token else self.UNKNOWN_ID))
+        return np.array(ids, dtype=np.int32)
+
+    @staticmethod
+    def caps_mask(tokens):
+        """Tokens that get ALL-CAPS emphasis: upper case while some other token is not"""
+        caps = np.fromiter((token.isupper() for token in tokens), dtype=bool, count=len(tokens))
+        if caps.all():
+            caps[:] = False
+        return caps
+
+    def compound_batch(self, encoded, exclamations=None, questions=None, caps=None):
+        """Compound scores for a batch of encoded texts, with optional !/? counts and caps masks per text"""
+        count = len(encoded)
+        if count == 0:
+            return np.zeros(0)
+        lengths = np.fromiter((len(ids) for ids in encoded), dtype=np.int64, count=count)
+        ids = np.concatenate(encoded) if lengths.sum() else np.zeros(0, dtype=np.int32)
+        if caps is None or not lengths.sum():
+            caps = np.zeros(len(ids), dtype=bool)
+        else:
+            caps = np.concatenate(caps)
+        doc = np.repeat(np.arange(count), lengths)
+        starts = np.cumsum(lengths) - lengths
+        position = np.arange(len(ids)) - starts[doc]
+
+        valence = self.valence[ids]
+        scored = self.scored[ids]
+        same_doc_next = np.zeros(len(ids), dtype=bool)
+        same_doc_next[:-1] = doc[:-1] == doc[1:]
+        next_ids = np.full_like(ids, self.UNKNOWN_ID)
+        next_ids[:-1] = ids[1:]
+        next_ids[~same_doc_next] = self.UNKNOWN_ID
+        # 'kind of' is a dampener, not the lexicon word 'kind'
+        kind_of = (ids == self.kind_id) & (next_ids == self.of_id)
+        valence[kind_of] = 0.0
+        scored &= ~kind_of
+        prevs = {}
+        for distance in (1, 2, 3):
+            prev = np.full_like(ids, self.UNKNOWN_ID)
+            if distance < len(ids):
+                prev[distance:] = ids[:-distance]
+            prevs[distance] = np.where(position >= distance, prev, self.UNKNOWN_ID)
+
+        # 'no' before a lexicon word negates that word instead of scoring on its own
+        base = valence
+        valence = np.where((ids == self.no_id) & self.in_lexicon[next_ids] & same_doc_next, 0.0, valence)
+        negated_by_no = (
+            (prevs[1] == self.no_id) | (prevs[2] == self.no_id)
+            | ((prevs[3] == self.no_id) & np.isin(prevs[1], self.or_nor_ids))
+        )
+        valence = np.where(scored & negated_by_no, base * N_SCALAR, valence)
+        valence = np.where(scored & caps, valence + np.where(valence > 0, C_INCR, -C_INCR), valence)
+        so_this_1 = np.isin(prevs[1], self.so_this_ids)
+        so_this_2 = np.isin(prevs[2], self.so_this_ids)
+        # VADER's 'never so/this' (x1.25) and 'without doubt' (no negation) exceptions
+        emphasis = {
+            1: np.zeros(len(ids), dtype=bool),
+            2: (prevs[2] == self.never_id) & so_this_1,
+            3: ((prevs[3] == self.never_id) & so_this_2) | so_this_1
+        }
+        exempt = {
+            1: np.zeros(len(ids), dtype=bool),
+            2: (prevs[2] == self.without_id) & (prevs[1] == self.doubt_id),
+            3: (prevs[3] == self.without_id) & ((prevs[2] == self.doubt_id) | (prevs[1] == self.doubt_id))
+        }
+
+        # Same order as VADER: add the boost from each preceding word, then check it for negation
+        for distance, damping in ((1, 1.0), (2, 0.95), (3, 0.9)):
+            prev = prevs[distance]
+            applies = scored & (position >= distance) & ~self.in_lexicon[prev]
+            boost = np.where(valence < 0, -self.booster[prev], self.booster[prev])
+            # Boosters in ALL CAPS add C_INCR on top of their own scalar
+            prev_caps = np.zeros(len(ids), dtype=bool)
+            prev_caps[distance:] = caps[:-distance] if distance < len(ids) else False
+            caps_boost = prev_caps & (self.booster[prev] != 0)
+            boost = boost + np.where(caps_boost, np.where(valence > 0, C_INCR, -C_INCR), 0.0)
+            valence = np.where(applies, valence + boost * damping, valence)
+            negate = applies & ~emphasis[distance] & ~exempt[distance] & self.negation[prev]
+            valence = np.where(applies & emphasis[distance], valence * 1.25, valence)
+            valence = np.where(negate, valence * N_SCALAR, valence)
+
+        # 'least' negates the next word, except in 'at least' and 'very least'
+        least = (prevs[1] == self.least_id) & ((position == 1) | ~np.isin(prevs[2], self.at_very_ids))
+        valence = np.where(scored & least, valence * N_SCALAR, valence)
+
+        # Contrastive 'but': halve what comes before the first one, boost what follows
+        is_but = ids == self.but_id
+        if is_but.any():
+            first_but = np.full(count, np.iinfo(np.int64).max)
+            np.minimum.at(first_but, doc[is_but], position[is_but])
+            pivot = first_but[doc]
+            has_but = pivot != np.iinfo(np.int64).max
+            valence = valence * np.where(
+                has_but & (position < pivot), 0.5, np.where(has_but & (position > pivot), 1.5, 1.0)
+            )
+
+        totals = np.bincount(doc, weights=valence, minlength=count).astype(float)
+        totals += np.sign(totals) * self._punctuation_emphasis(count, exclamations, questions)
+        compound = totals / np.sqrt(totals * totals + 15)
+        return np.round(np.clip(compound, -1.0, 1.0), 4)
+
+    @staticmethod
+    def _punctuation_emphasis(count, exclamations, questions):
+        emphasis = np.zeros(count)
+        if exclamations is not None:
+            emphasis += np.minimum(np.asarray(exclamations), 4) * 0.292
+        if questions is not None:
+            questions = np.asarray(questions)
+            emphasis += np.where(questions > 3, 0.96, np.where(questions > 1, questions * 0.18, 0.0))
+        return emphasis
+
+    def compound_scores(self, texts):
+        """Tokenize, encode and score raw texts"""
+        texts = list(texts)
+        tokenized = [self.tokenize(text) for text in texts]
+        encoded = [self.encode(tokens) for tokens in tokenized]
+        caps = [self.caps_mask(tokens) for tokens in tokenized]
+        exclamations = [text.count('!') for text in texts]
+        questions = [text.count('?') for text in texts]
+        return self.compound_batch(encoded, exclamations, questions, caps)
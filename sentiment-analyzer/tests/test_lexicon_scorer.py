@@ -0,0 +1,130 @@
+"""CompactLexiconScorer against VADER's polarity_scores.
+
+Every reproduced rule has a fixed case in RULE_CASES that must match
+polarity_scores exactly. Tolerance, checked on a seeded synthetic corpus of
+social-media style texts in sentence case with occasional ALL-CAPS words,
+mixing lexicon words, boosters, negations, 'no', 'least', 'but', '!' and '?':
+  - mean absolute compound difference <= 0.005
+  - Positive/Negative/Neutral label agreement (+-0.05 thresholds) >= 99%
+Special idioms ('kind of', 'the shit', ...) and emoji descriptions are skipped
+by the fast path, so idiom- or emoji-heavy text will drift further than this.
+
+Run from sentiment-analyzer/: python -m pytest tests
+"""
+import os
+import random
+import sys
+
+import pytest
+from vaderSentiment.vaderSentiment import BOOSTER_DICT, NEGATE, SentimentIntensityAnalyzer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lexicon_scorer import CompactLexiconScorer
+
+MAX_MEAN_ABS_ERROR = 0.005
+MIN_LABEL_AGREEMENT = 0.99
+
+# One case per rule the fast path reproduces
+RULE_CASES = [
+    "The food was good",                           # lexicon valence
+    "The food was really good",                    # booster
+    "The food was somewhat good",                  # dampener
+    "The food was not good",                       # negation, 1 word back
+    "The food isn't very good",                    # negation, 2 words back
+    "Never so happy with a delivery",              # 'never so' exception
+    "Without doubt the best team",                 # 'without doubt' exception
+    "No good at all",                              # 'no' zeroed and negates the next word
+    "There is no love here",                       # 'no' negates 2 words ahead
+    "No fun or good",                              # 'no ... or' 3 words back
+    "no",                                          # standalone 'no' keeps its valence
+    "The least helpful staff",                     # 'least' negation
+    "At least helpful staff",                      # 'at least' exception
+    "The food was GOOD",                           # ALL-CAPS lexicon word
+    "The food was VERY good",                      # ALL-CAPS booster
+    "GREAT FOOD GREAT STAFF",                      # all words caps: no emphasis
+    "Kind people",                                 # 'kind' outside 'kind of'
+    "The phone is great but the service is slow",  # contrastive 'but'
+    "The movie was good!!",                        # exclamation emphasis
+    "Was the update bad??",                        # question emphasis
+]
+
+FILLER = ['the', 'a', 'this', 'phone', 'service', 'movie', 'was', 'is', 'it', 'i', 'we', 'today',
+          'and', 'to', 'with', 'our', 'team', 'update', 'delivery', 'food', 'staff', 'really']
+
+
+def build_corpus(lexicon, size=20000, seed=0):
+    rng = random.Random(seed)
+    lexicon_words = [w for w in lexicon if w.isalpha()]
+    boosters = [w for w in BOOSTER_DICT if ' ' not in w]
+    negations = [w for w in NEGATE if "'" not in w]
+    corpus = []
+    for _ in range(size):
+        words = []
+        for _ in range(rng.randint(4, 30)):
+            roll = rng.random()
+            if roll < 0.15:
+                word = rng.choice(lexicon_words)
+            elif roll < 0.20:
+                word = rng.choice(boosters)
+            elif roll < 0.24:
+                word = rng.choice(negations)
+            elif roll < 0.25:
+                word = 'but'
+            elif roll < 0.27:
+                word = 'no'
+            elif roll < 0.275:
+                word = 'least'
+            else:
+                word = rng.choice(FILLER)
+            if rng.random() < 0.03:
+                word = word.upper()
+            words.append(word)
+        words[0] = words[0][:1].upper() + words[0][1:]
+        text = ' '.join(words)
+        text += rng.choice(['', '.', '!', '!!', '?', '??', '?!'])
+        corpus.append(text)
+    return corpus
+
+
+def label(score):
+    return 'Positive' if score >= 0.05 else 'Negative' if score <= -0.05 else 'Neutral'
+
+
+@pytest.fixture(scope='module')
+def sia():
+    return SentimentIntensityAnalyzer()
+
+
+@pytest.fixture(scope='module')
+def scorer(sia):
+    return CompactLexiconScorer(sia.lexicon)
+
+
+@pytest.mark.parametrize('text', RULE_CASES)
+def test_rule_case_matches_polarity_scores(sia, scorer, text):
+    expected = sia.polarity_scores(text)['compound']
+    assert scorer.compound_scores([text])[0] == pytest.approx(expected, abs=1e-4)
+
+
+def test_batch_scores_match_single_text_scores(scorer):
+    batch = scorer.compound_scores(RULE_CASES)
+    single = [scorer.compound_scores([text])[0] for text in RULE_CASES]
+    assert list(batch) == single
+
+
+def test_empty_inputs(scorer):
+    assert len(scorer.compound_scores([])) == 0
+    assert list(scorer.compound_scores(['', '!!'])) == [0.0, 0.0]
+
+
+def test_corpus_within_documented_tolerance(sia, scorer):
+    corpus = build_corpus(sia.lexicon, size=5000)
+    reference = [sia.polarity_scores(text)['compound'] for text in corpus]
+    fast = scorer.compound_scores(corpus)
+
+    mean_error = sum(abs(a - b) for a, b in zip(reference, fast)) / len(corpus)
+    agreement = sum(label(a) == label(b) for a, b in zip(reference, fast)) / len(corpus)
+
+    assert mean_error <= MAX_MEAN_ABS_ERROR
+    assert agreement >= MIN_LABEL_AGREEMENT
@@ -0,0 +1,49 @@
+import re
+import string
+
+# URLs and @mentions/#hashtags in one pattern. Every match starts with one of
+# h, w, @ or #, which lets the regex engine skip ahead between candidates.
+# A mention stops where a URL would begin so the result matches stripping
+# URLs first and mentions second.
+_TOKEN_PATTERN = re.compile(
+    r'[hw@#](?:(?<=h)ttp\S+|(?<=w)ww\S+|(?<=[@#])(?:(?!(?:http|www)\S)\w)+)'
+)
+
+# Deletes punctuation and folds ASCII case in the same translate pass
+_TRANSLATION = {ord(ch): None for ch in string.punctuation}
+_TRANSLATION.update({ord(ch): ch.lower() for ch in string.ascii_uppercase})
+_TRANSLATION = str.maketrans(_TRANSLATION)
+
+# Whitespace, so URLs and mentions never run across it, and absent from real text
+_BATCH_SEPARATOR = '\x1e'
+
+
+def _has_tokens(text):
+    return 'http' in text or 'www' in text or '@' in text or '#' in text
+
+
+def normalize_text(text):
+    """Strip URLs, mentions and hashtags, collapse whitespace, drop punctuation and lowercase"""
+    if _has_tokens(text):
+        text = _TOKEN_PATTERN.sub('', text)
+    text = ' '.join(text.split()).translate(_TRANSLATION)
+    return text if text.isascii() else text.lower()
+
+
+def normalize_texts(texts):
+    """normalize_text over many strings, sharing the regex and translate passes"""
+    texts = list(texts)
+    if not texts:
+        return []
+    joined = _BATCH_SEPARATOR.join(texts)
+    if joined.count(_BATCH_SEPARATOR) != len(texts) - 1:
+        return [normalize_text(text) for text in texts]
+
+    if _has_tokens(joined):
+        joined = _TOKEN_PATTERN.sub('', joined)
+    joined = _BATCH_SEPARATOR.join(
+        ' '.join(piece.split()) for piece in joined.split(_BATCH_SEPARATOR)
+    ).translate(_TRANSLATION)
+    if not joined.isascii():
+        joined = joined.lower()
+    return joined.split(_BATCH_SEPARATOR)
@@ -1,11 +1,12 @@
-from flask import Flask, render_template, request, jsonify, session
+from flask import Flask, render_template, request, jsonify, session, send_file
 from flask_cors import CORS
 from flask_session import Session
 import speech_recognition as sr
 import pyttsx3
-import requests
 import threading
-import time
+import queue
+import itertools
+import hashlib
 import os
 import json
 import uuid
@@ -13,7 +14,14 @@ import schedule
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
 import logging
-from functools import lru_cache
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+import base64
+from reminder_scheduler import ReminderScheduler
+from history_store import HistoryStore
+from data_cache import TTLCache, create_http_session
+from data_sources import fetch_weather, fetch_news
+from intent_matcher import IntentRegistry
+from session_backend import SQLiteSessionInterface
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -22,9 +30,15 @@ load_dotenv()
 
 app = Flask(__name__)
 app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'voice-assistant-secret-key')
-app.config['SESSION_TYPE'] = 'filesystem'
+app.config['SESSION_TYPE'] = os.getenv('SESSION_TYPE', 'sqlite')
 app.config['SESSION_PERMANENT'] = False
-Session(app)
+if app.config['SESSION_TYPE'] == 'sqlite':
+    app.session_interface = SQLiteSessionInterface(
+        os.getenv('SESSION_DB_PATH', 'sessions.db'),
+        ttl=int(os.getenv('SESSION_TTL', 86400))
+    )
+else:
+    Session(app)
 
 CORS(app)
 
@@ -32,13 +46,42 @@ CORS(app)
 WEATHER_API_KEY = os.getenv('WEATHER_API_KEY')
 NEWS_API_KEY = os.getenv('NEWS_API_KEY')
 OPENWEATHER_API_KEY = os.getenv('OPENWEATHER_API_KEY')
+REMINDER_DB_PATH = os.getenv('REMINDER_DB_PATH', 'reminders.db')
+TTS_CACHE_DIR = os.getenv('TTS_CACHE_DIR', 'tts_cache')
+HISTORY_DB_PATH = os.getenv('HISTORY_DB_PATH')
+HISTORY_MAX_PER_SESSION = int(os.getenv('HISTORY_MAX_PER_SESSION', 200))
+MAX_PIPELINE_COMMANDS = int(os.getenv('MAX_PIPELINE_COMMANDS', 10))
+PIPELINE_RENDER_TIMEOUT = float(os.getenv('PIPELINE_RENDER_TIMEOUT', 30))
+
+OPENWEATHER_API_URL = os.getenv('OPENWEATHER_API_URL', 'http://api.openweathermap.org/data/2.5/weather')
+NEWS_API_URL = os.getenv('NEWS_API_URL', 'https://newsapi.org/v2/top-headlines')
+WEATHER_CACHE_TTL = int(os.getenv('WEATHER_CACHE_TTL', 600))
+NEWS_CACHE_TTL = int(os.getenv('NEWS_CACHE_TTL', 300))
+
+http = create_http_session()
+data_cache = TTLCache(
+    stale_ttl=int(os.getenv('DATA_CACHE_STALE_TTL', 900)),
+    negative_ttl=int(os.getenv('DATA_CACHE_NEGATIVE_TTL', 30))
+)
 
 class AdvancedTTS:
-    def __init__(self):
-        self.tts_queue = []
-        self.currently_speaking = False
+    """Single long-lived TTS worker; one engine serves every utterance and render"""
+
+    SPEAK_PRIORITY = 0
+    DEFAULT_PRIORITY = 1
+    PREWARM_PRIORITY = 2
+
+    def __init__(self, cache_dir=TTS_CACHE_DIR, max_cache_files=500):
+        self.tts_queue = queue.PriorityQueue()
+        self.sequence = itertools.count()
         self.engine = None
-        self.init_engine()
+        self.cache_dir = cache_dir
+        self.max_cache_files = max_cache_files
+        os.makedirs(self.cache_dir, exist_ok=True)
+        # The engine must be created and driven from a single thread
+        self.worker = threading.Thread(target=self._worker_loop)
+        self.worker.daemon = True
+        self.worker.start()
         
     def init_engine(self):
         """Initialize TTS engine with fallbacks"""
@@ -56,151 +99,193 @@ class AdvancedTTS:
             self.engine = None
     
     def speak(self, text, priority=False):
-        """Add text to speech queue"""
-        if priority:
-            self.tts_queue.insert(0, text)  
+        """Queue text to be spoken on the server speakers"""
+        level = self.SPEAK_PRIORITY if priority else self.DEFAULT_PRIORITY
+        self.tts_queue.put((level, next(self.sequence), 'speak', text, None))
+    
+    def render(self, text, timeout=30):
+        """Path to a cached audio file for text, rendering it on the worker if needed"""
+        return self.render_async(text).result(timeout=timeout)
+    
+    def render_async(self, text):
+        """Future for the cached audio path of text, so several renders can be queued at once"""
+        result = Future()
+        path = self._cache_path(text)
+        if self._touch(path):
+            result.set_result(path)
         else:
-            self.tts_queue.append(text)
-        
-        if not self.currently_speaking:
-            self.process_queue()
+            self.tts_queue.put((self.DEFAULT_PRIORITY, next(self.sequence), 'render', text, result))
+        return result
     
-    def process_queue(self):
-        """Process the TTS queue"""
-        if not self.tts_queue or self.currently_speaking:
-            return
-            
-        self.currently_speaking = True
-        thread = threading.Thread(target=self._process_queue_thread)
-        thread.daemon = True
-        thread.start()
+    def prewarm(self, phrases):
+        """Render frequently used phrases in the background"""
+        for text in phrases:
+            if not os.path.exists(self._cache_path(text)):
+                self.tts_queue.put((self.PREWARM_PRIORITY, next(self.sequence), 'render', text, None))
     
-    def _process_queue_thread(self):
-        """Thread for processing TTS queue"""
-        while self.tts_queue:
+    @staticmethod
+    def _touch(path):
+        """Mark a cached file as used so eviction keeps it; False when it is not cached"""
+        try:
+            os.utime(path)
+            return True
+        except OSError:
+            return False
+    
+    def _cache_path(self, text):
+        key = hashlib.sha1(text.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, f"{key}.wav")
+    
+    def _worker_loop(self):
+        """Process speak and render jobs in priority order"""
+        self.init_engine()
+        while True:
+            _, _, action, text, result = self.tts_queue.get()
             try:
-                text = self.tts_queue.pop(0)
-                self._speak_sync(text)
-                time.sleep(0.5)  
-            except IndexError:
-                break
-        self.currently_speaking = False
+                if self.engine is None:
+                    raise RuntimeError("TTS engine is not available")
+                if action == 'speak':
+                    self.engine.say(text)
+                    self.engine.runAndWait()
+                else:
+                    path = self._render_to_cache(text)
+                    if result:
+                        result.set_result(path)
+            except Exception as e:
+                logger.error(f"TTS error: {e}")
+                if result:
+                    result.set_exception(e)
+            finally:
+                self.tts_queue.task_done()
     
-    def _speak_sync(self, text):
-        """Synchronous speech with new engine instance"""
-        try:
-            engine = pyttsx3.init()
-            engine.setProperty('rate', 180)
-            voices = engine.getProperty('voices')
-            if len(voices) > 1:
-                engine.setProperty('voice', voices[1].id)
-            engine.say(text)
-            engine.runAndWait()
-            engine.stop()
-        except Exception as e:
-            logger.error(f"TTS error: {e}")
+    def _render_to_cache(self, text):
+        path = self._cache_path(text)
+        if os.path.exists(path):
+            return path
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp.wav"
+        self.engine.save_to_file(text, tmp_path)
+        self.engine.runAndWait()
+        os.replace(tmp_path, path)
+        self._evict_cache()
+        return path
+    
+    def _evict_cache(self):
+        """Drop the least recently used files once the cache is over its limit.
+
+        Uses mtime, which render() bumps on every hit, because atime is not
+        updated on relatime or noatime mounts.
+        """
+        entries = [e for e in os.scandir(self.cache_dir) if e.name.endswith('.wav')]
+        if len(entries) <= self.max_cache_files:
+            return
+        entries.sort(key=lambda e: e.stat().st_mtime)
+        for entry in entries[:len(entries) - self.max_cache_files]:
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass
 
 tts_system = AdvancedTTS()
 
+# Intents in priority order: when a command matches several, the earlier one wins
+INTENTS = [
+    ('greeting', ["hello", "hi", "hey", "greetings"]),
+    ('time', ["time", "what time", "current time"]),
+    ('date', ["date", "what date", "today's date"]),
+    ('weather', ["weather"]),
+    ('news', ["news"]),
+    ('reminder', ["remind", "reminder", "reminding", "reminded"]),
+    ('joke', ["joke", "jokes"]),
+    ('thanks', ["thank", "thanks", "thank you", "thankful", "appreciate", "appreciated"]),
+    ('goodbye', ["bye", "goodbye", "see you", "exit"]),
+    ('help', ["help", "helping", "what can you do"])
+]
+
+SLOTS = {
+    'location': {
+        location: [location]
+        for location in ["new york", "london", "paris", "tokyo", "mumbai", "delhi"]
+    },
+    'category': {
+        'technology': ['tech', 'technology', 'computer'],
+        'sports': ['sports', 'game', 'football'],
+        'business': ['business', 'economy', 'market'],
+        'entertainment': ['entertainment', 'movie', 'celebrity']
+    }
+}
+
 class AdvancedVoiceAssistant:
     def __init__(self):
         self.recognizer = sr.Recognizer()
-        self.reminders = []
-        self.conversation_history = []
+        self.conversation_history = HistoryStore(
+            max_per_session=HISTORY_MAX_PER_SESSION,
+            db_path=HISTORY_DB_PATH
+        )
         self.user_preferences = {
             'location': 'New York',
             'news_categories': ['technology', 'general'],
             'speech_rate': 180
         }
-        self.setup_reminder_scheduler()
+        self.reminders = ReminderScheduler(REMINDER_DB_PATH, self._announce_reminder)
+        self.intents = IntentRegistry.from_spec(INTENTS, SLOTS)
+        # Weather and news handlers block on network I/O, so batches run them side by side
+        self.executor = ThreadPoolExecutor(max_workers=8)
     
-    def setup_reminder_scheduler(self):
-        """Setup background thread for checking reminders"""
-        def check_reminders():
-            while True:
-                now = datetime.now()
-                reminders_to_remove = []
-                
-                for i, reminder in enumerate(self.reminders):
-                    if reminder['time'] <= now:
-                        message = f"Reminder: {reminder['message']}"
-                        tts_system.speak(message, priority=True)
-                        reminders_to_remove.append(i)
-                
-                for i in sorted(reminders_to_remove, reverse=True):
-                    self.reminders.pop(i)
-                
-                time.sleep(30)  
-        
-        reminder_thread = threading.Thread(target=check_reminders)
-        reminder_thread.daemon = True
-        reminder_thread.start()
+    def _announce_reminder(self, reminder):
+        """Speak a reminder when it comes due"""
+        tts_system.speak(f"Reminder: {reminder['message']}", priority=True)
     
     def text_to_speech(self, text):
         """Convert text to speech"""
         tts_system.speak(text)
         return {"status": "success", "message": text}
     
-    @lru_cache(maxsize=100)
     def get_weather(self, location=None):
         """Get weather information with caching"""
         if not OPENWEATHER_API_KEY:
             return "Weather service is not configured. Please add OpenWeather API key."
         
         location = location or self.user_preferences['location']
-        
-        try:
-            url = f"http://api.openweathermap.org/data/2.5/weather?q={location}&appid={OPENWEATHER_API_KEY}&units=metric"
-            response = requests.get(url, timeout=10)
-            data = response.json()
-            
-            if response.status_code == 200:
-                temp = data['main']['temp']
-                description = data['weather'][0]['description']
-                humidity = data['main']['humidity']
-                return f"In {location}, it's {temp}°C with {description}. Humidity is {humidity}%."
-            else:
-                return f"Could not get weather for {location}. Please try again later."
-        except Exception as e:
-            logger.error(f"Weather API error: {e}")
-            return "Sorry, I'm having trouble accessing weather information."
+        return data_cache.get(
+            ('weather', location.lower()),
+            lambda: self._fetch_weather(location),
+            WEATHER_CACHE_TTL
+        )
+    
+    def _fetch_weather(self, location):
+        return fetch_weather(http, OPENWEATHER_API_URL, OPENWEATHER_API_KEY, location)
     
     def get_news(self, category='general'):
-        """Get news headlines"""
+        """Get news headlines with caching"""
         if not NEWS_API_KEY:
             return "News service is not configured. Please add News API key."
         
-        try:
-            url = f"https://newsapi.org/v2/top-headlines?category={category}&country=us&apiKey={NEWS_API_KEY}"
-            response = requests.get(url, timeout=10)
-            data = response.json()
-            
-            if response.status_code == 200 and data['articles']:
-                articles = data['articles'][:3] 
-                news_items = []
-                for article in articles:
-                    title = article['title']
-                    source = article['source']['name']
-                    news_items.append(f"{title} from {source}")
-                
-                return f"Here are the latest {category} news: {' '.join(news_items)}"
-            else:
-                return f"Could not fetch {category} news at the moment."
-        except Exception as e:
-            logger.error(f"News API error: {e}")
-            return "Sorry, I'm having trouble accessing news."
+        return data_cache.get(
+            ('news', category),
+            lambda: self._fetch_news(category),
+            NEWS_CACHE_TTL
+        )
+    
+    def _fetch_news(self, category):
+        return fetch_news(http, NEWS_API_URL, NEWS_API_KEY, category)
+    
+    def warm_data_cache(self):
+        """Prefetch the default location and news categories, then keep popular lookups fresh"""
+        items = []
+        if OPENWEATHER_API_KEY:
+            location = self.user_preferences['location']
+            items.append((('weather', location.lower()), lambda: self._fetch_weather(location), WEATHER_CACHE_TTL))
+        if NEWS_API_KEY:
+            for category in self.user_preferences['news_categories']:
+                items.append((('news', category), lambda c=category: self._fetch_news(c), NEWS_CACHE_TTL))
+        data_cache.warm(items)
+        data_cache.start_prefetch(interval=60, top_n=10)
     
     def set_reminder(self, message, minutes):
         """Set a reminder"""
         try:
             reminder_time = datetime.now() + timedelta(minutes=minutes)
-            reminder = {
-                'id': str(uuid.uuid4()),
-                'message': message,
-                'time': reminder_time,
-                'set_time': datetime.now()
-            }
-            self.reminders.append(reminder)
+            self.reminders.add(message, reminder_time)
             return f"I'll remind you about '{message}' in {minutes} minute{'s' if minutes != 1 else ''}."
         except Exception as e:
             logger.error(f"Reminder error: {e}")
@@ -217,88 +302,67 @@ class AdvancedVoiceAssistant:
         """Process voice commands with context"""
         command = command.lower()
         
-        self.conversation_history.append({
-            'session_id': session_id,
-            'timestamp': datetime.now(),
-            'command': command,
-            'type': 'user'
-        })
+        self.conversation_history.append(session_id, 'user', command)
         
         response = self._determine_response(command)
         
         # Store assistant response
-        self.conversation_history.append({
-            'session_id': session_id,
-            'timestamp': datetime.now(),
-            'response': response,
-            'type': 'assistant'
-        })
+        self.conversation_history.append(session_id, 'assistant', response)
         
         return response
     
+    def process_commands(self, commands, session_id):
+        """Process several commands concurrently, recording history in request order"""
+        commands = [command.lower() for command in commands]
+        futures = [self.executor.submit(self._determine_response, command) for command in commands]
+        
+        responses = []
+        for command, future in zip(commands, futures):
+            try:
+                response = future.result()
+            except Exception as e:
+                logger.error(f"Pipeline command error: {e}")
+                response = "Sorry, I encountered an error processing that request."
+            self.conversation_history.append(session_id, 'user', command)
+            self.conversation_history.append(session_id, 'assistant', response)
+            responses.append(response)
+        return responses
+    
     def _determine_response(self, command):
         """Determine appropriate response based on command"""
-        # Greeting
-        if any(word in command for word in ["hello", "hi", "hey", "greetings"]):
-            return "Hello! How can I assist you today?"
+        intent, slots = self.intents.match(command)
         
-        # Time and date
-        elif any(word in command for word in ["time", "what time", "current time"]):
-            return self.get_time_date()
+        if intent == 'greeting':
+            return "Hello! How can I assist you today?"
         
-        elif any(word in command for word in ["date", "what date", "today's date"]):
+        elif intent in ('time', 'date'):
             return self.get_time_date()
         
-        # Weather
-        elif "weather" in command:
-            location = self._extract_location(command)
-            return self.get_weather(location)
+        elif intent == 'weather':
+            return self.get_weather(slots.get('location'))
         
-        elif "news" in command:
-            category = self._extract_news_category(command)
-            return self.get_news(category)
+        elif intent == 'news':
+            return self.get_news(slots.get('category', 'general'))
         
-        elif "remind" in command or "reminder" in command:
+        elif intent == 'reminder':
             return self._handle_reminder(command)
         
-        elif "joke" in command:
+        elif intent == 'joke':
             import pyjokes
             return pyjokes.get_joke()
 
-        elif any(word in command for word in ["thank", "thanks", "appreciate"]):
+        elif intent == 'thanks':
             return "You're welcome! Is there anything else I can help with?"
     
-        elif any(word in command for word in ["bye", "goodbye", "see you", "exit"]):
+        elif intent == 'goodbye':
             return "Goodbye! Have a wonderful day!"
         
-        elif "help" in command or "what can you do" in command:
+        elif intent == 'help':
             return self._get_help_message()
         
         else:
             return "I'm not sure how to help with that. You can ask me about time, weather, news, or to set reminders."
     
-    def _extract_location(self, command):
-        """Extract location from command"""
-        locations = ["new york", "london", "paris", "tokyo", "mumbai", "delhi"]
-        for location in locations:
-            if location in command:
-                return location
-        return None
-    
-    def _extract_news_category(self, command):
-        """Extract news category from command"""
-        categories = {
-            'technology': ['tech', 'technology', 'computer'],
-            'sports': ['sports', 'game', 'football'],
-            'business': ['business', 'economy', 'market'],
-            'entertainment': ['entertainment', 'movie', 'celebrity']
-        }
-        
-        for category, keywords in categories.items():
-            if any(keyword in command for keyword in keywords):
-                return category
-        return 'general'
-    
     def _handle_reminder(self, command):
         """Handle reminder commands"""
         try:
@@ -337,6 +401,15 @@ Try saying:
 
 # here we Initialize assistant
 assistant = AdvancedVoiceAssistant()
+assistant.warm_data_cache()
+
+tts_system.prewarm([
+    "Hello! How can I assist you today?",
+    "You're welcome! Is there anything else I can help with?",
+    "Goodbye! Have a wonderful day!",
+    "I'm not sure how to help with that. You can ask me about time, weather, news, or to set reminders.",
+    assistant._get_help_message()
+])
 
 @app.route('/')
 def index():
@@ -348,6 +421,12 @@ def index():
 def speak():
     data = request.json
     text = data.get('text', '')
+    if data.get('mode') == 'audio':
+        try:
+            return send_file(tts_system.render(text), mimetype='audio/wav')
+        except Exception as e:
+            logger.error(f"TTS render error: {e}")
+            return jsonify({"status": "error", "message": "Audio rendering is unavailable"}), 503
     result = assistant.text_to_speech(text)
     return jsonify(result)
 
@@ -359,26 +438,66 @@ def process_command():
     response = assistant.process_command(command, session_id)
     return jsonify({"response": response})
 
+@app.route('/pipeline', methods=['POST'])
+def process_pipeline():
+    """Process a batch of commands, optionally speaking or returning audio in the same call"""
+    data = request.json
+    commands = data.get('commands', [])
+    if not isinstance(commands, list):
+        return jsonify({"error": "commands must be a list"}), 400
+    commands = [c for c in commands if isinstance(c, str) and c.strip()]
+    if not commands:
+        return jsonify({"error": "No commands provided"}), 400
+    if len(commands) > MAX_PIPELINE_COMMANDS:
+        return jsonify({"error": f"At most {MAX_PIPELINE_COMMANDS} commands per request"}), 400
+    
+    session_id = session.get('session_id', 'default')
+    responses = assistant.process_commands(commands, session_id)
+    results = [{"command": command, "response": response} for command, response in zip(commands, responses)]
+    
+    if data.get('speak'):
+        for response in responses:
+            tts_system.speak(response)
+    
+    if data.get('audio'):
+        # Queue every render up front and wait on one shared deadline
+        futures = [tts_system.render_async(result['response']) for result in results]
+        wait(futures, timeout=PIPELINE_RENDER_TIMEOUT)
+        for result, future in zip(results, futures):
+            result['audio'] = None
+            if not future.done():
+                logger.error(f"TTS render timed out for: {result['response'][:50]}")
+                continue
+            try:
+                with open(future.result(), 'rb') as f:
+                    result['audio'] = base64.b64encode(f.read()).decode('ascii')
+            except Exception as e:
+                logger.error(f"TTS render error: {e}")
+    
+    return jsonify({"results": results})
+
 @app.route('/reminders', methods=['GET'])
 def get_reminders():
+    limit = max(1, min(request.args.get('limit', 100, type=int), 1000))
+    offset = max(0, request.args.get('offset', 0, type=int))
     reminders = [
         {
+            'id': reminder['id'],
             'message': reminder['message'],
             'time': reminder['time'].strftime('%Y-%m-%d %H:%M:%S'),
             'set_time': reminder['set_time'].strftime('%Y-%m-%d %H:%M:%S')
         }
-        for reminder in assistant.reminders
+        for reminder in assistant.reminders.pending(limit, offset)
     ]
     return jsonify({"reminders": reminders})
 
 @app.route('/history', methods=['GET'])
 def get_history():
     session_id = session.get('session_id', 'default')
-    user_history = [
-        item for item in assistant.conversation_history 
-        if item['session_id'] == session_id
-    ]
-    return jsonify({"history": user_history})
+    limit = max(1, min(request.args.get('limit', 50, type=int), 500))
+    before = request.args.get('cursor', type=int)
+    user_history, next_cursor = assistant.conversation_history.page(session_id, before, limit)
+    return jsonify({"history": user_history, "next_cursor": next_cursor})
 
 if __name__ == '__main__':
     app.run(debug=True, port=5000, threaded=True)
\ No newline at end of file
@@ -0,0 +1,58 @@
+"""Per-command latency of the intent matcher as the number of intents grows.
+
+Compares IntentRegistry against the substring if/elif scan it replaced.
+Run from voice-assistant3/: python benchmarks/bench_intents.py
+"""
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from intent_matcher import IntentRegistry
+
+COMMANDS = [
+    "what's the weather in london",
+    "tell me technology news",
+    "remind me in 10 minutes to take a break",
+    "what time is it",
+    "this is something the assistant does not know about at all",
+]
+
+
+def synthetic_intents(count, seed=0):
+    rng = random.Random(seed)
+    letters = 'abcdefghijklmnopqrstuvwxyz'
+    intents = []
+    for i in range(count):
+        phrases = [''.join(rng.choice(letters) for _ in range(rng.randint(4, 9))) for _ in range(4)]
+        intents.append((f"intent_{i}", phrases))
+    return intents
+
+
+def substring_scan(intents, command):
+    """The previous approach: one any(...) substring scan per intent, in order"""
+    for name, phrases in intents:
+        if any(phrase in command for phrase in phrases):
+            return name
+    return None
+
+
+def main():
+    base = [('weather', ['weather']), ('news', ['news']), ('reminder', ['remind', 'reminder']),
+            ('time', ['time', 'what time'])]
+    print(f"{'intents':>8} {'substring us/cmd':>18} {'registry us/cmd':>17}")
+    for count in (10, 100, 1000, 10000):
+        # Synthetic intents go first so unmatched commands scan everything, as new intents would
+        intents = synthetic_intents(count) + base
+        registry = IntentRegistry.from_spec(intents)
+        runs = 200
+        scan = timeit.timeit(lambda: [substring_scan(intents, c) for c in COMMANDS], number=runs)
+        compiled = timeit.timeit(lambda: [registry.match(c) for c in COMMANDS], number=runs)
+        per_command = runs * len(COMMANDS)
+        print(f"{count:>8} {scan / per_command * 1e6:>18.2f} {compiled / per_command * 1e6:>17.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+"""Request latency and inode usage of the session backends under concurrent load.
+
+Compares Flask-Session's filesystem backend with SQLiteSessionInterface.
+Run from voice-assistant3/: python benchmarks/bench_sessions.py --clients 50 --requests 40
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask, session
+from flask_session import Session
+from session_backend import SQLiteSessionInterface
+
+
+def build_app(backend, workdir):
+    app = Flask(__name__)
+    app.config['SECRET_KEY'] = 'benchmark'
+    app.config['SESSION_PERMANENT'] = False
+    if backend == 'filesystem':
+        app.config['SESSION_TYPE'] = 'filesystem'
+        app.config['SESSION_FILE_DIR'] = os.path.join(workdir, 'flask_session')
+        Session(app)
+    else:
+        app.session_interface = SQLiteSessionInterface(os.path.join(workdir, 'sessions.db'))
+
+    @app.route('/touch')
+    def touch():
+        # Mirrors the assistant: create a session id once, then read it on every request
+        if 'session_id' not in session:
+            session['session_id'] = str(uuid.uuid4())
+        return session['session_id']
+
+    return app
+
+
+def count_inodes(path):
+    total = 0
+    for _, dirs, files in os.walk(path):
+        total += len(dirs) + len(files)
+    return total
+
+
+def percentile(sorted_values, pct):
+    index = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def run(backend, clients, requests_per_client):
+    with tempfile.TemporaryDirectory() as workdir:
+        app = build_app(backend, workdir)
+        latencies = []
+        lock = threading.Lock()
+
+        def client_loop():
+            client = app.test_client()
+            local = []
+            for _ in range(requests_per_client):
+                started = time.perf_counter()
+                client.get('/touch')
+                local.append(time.perf_counter() - started)
+            with lock:
+                latencies.extend(local)
+
+        threads = [threading.Thread(target=client_loop) for _ in range(clients)]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        latencies.sort()
+        return {
+            'backend': backend,
+            'throughput': len(latencies) / elapsed,
+            'p50': percentile(latencies, 50) * 1000,
+            'p95': percentile(latencies, 95) * 1000,
+            'p99': percentile(latencies, 99) * 1000,
+            'inodes': count_inodes(workdir)
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--clients', type=int, default=50, help='concurrent clients, one session each')
+    parser.add_argument('--requests', type=int, default=40, help='requests per client')
+    args = parser.parse_args()
+
+    print(f"{'backend':>10} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'inodes':>7}")
+    for backend in ('filesystem', 'sqlite'):
+        r = run(backend, args.clients, args.requests)
+        print(f"{r['backend']:>10} {r['throughput']:>9.1f} {r['p50']:>8.2f} {r['p95']:>8.2f} "
+              f"{r['p99']:>8.2f} {r['inodes']:>7}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,147 @@
+import logging
+import threading
+import time
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import requests
+import schedule
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+
+def create_http_session(pool_size=20):
+    """Keep-alive session with a connection pool for outbound API calls"""
+    http = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    http.mount('http://', adapter)
+    http.mount('https://', adapter)
+    return http
+
+
+class CacheEntry:
+    def __init__(self, value, ok, ttl, stale_ttl, now):
+        self.value = value
+        self.ok = ok
+        self.expires_at = now + ttl
+        # Failed lookups are never served stale
+        self.stale_until = self.expires_at + (stale_ttl if ok else 0)
+        self.refreshing = False
+        # Earliest time to retry a background refresh after one failed
+        self.retry_at = 0
+
+
+class TTLCache:
+    """TTL cache with stale-while-revalidate, negative caching and popularity-based prefetch.
+
+    Loaders return (value, ok); failures are cached for `negative_ttl` seconds only,
+    and a failed background refresh is not retried for `negative_ttl` seconds.
+    `clock` returns the current time in seconds and can be replaced in tests.
+    """
+
+    def __init__(self, max_entries=1000, stale_ttl=600, negative_ttl=30, workers=4, clock=time.monotonic):
+        self.clock = clock
+        self.max_entries = max_entries
+        self.stale_ttl = stale_ttl
+        self.negative_ttl = negative_ttl
+        self.entries = OrderedDict()
+        self.loaders = {}
+        self.popularity = Counter()
+        self.lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+        self.scheduler = schedule.Scheduler()
+
+    def get(self, key, loader, ttl):
+        """Cached value for key, loading it with loader() on a miss"""
+        now = self.clock()
+        with self.lock:
+            self.loaders[key] = (loader, ttl)
+            self.popularity[key] += 1
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+                if now < entry.expires_at:
+                    return entry.value
+                if now < entry.stale_until:
+                    self._refresh_in_background(key, entry)
+                    return entry.value
+
+        return self._load(key, loader, ttl)
+
+    def _load(self, key, loader, ttl):
+        try:
+            value, ok = loader()
+        except Exception as e:
+            logger.error(f"Cache loader error for {key}: {e}")
+            raise
+        entry = CacheEntry(value, ok, ttl if ok else self.negative_ttl, self.stale_ttl, self.clock())
+        with self.lock:
+            self.entries[key] = entry
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                evicted, _ = self.entries.popitem(last=False)
+                self.loaders.pop(evicted, None)
+                self.popularity.pop(evicted, None)
+        return value
+
+    def _refresh_in_background(self, key, entry):
+        """Reload an expired entry once; callers keep getting the stale value meanwhile. Lock held."""
+        if entry.refreshing or self.clock() < entry.retry_at:
+            return
+        entry.refreshing = True
+        loader, ttl = self.loaders[key]
+
+        def refresh():
+            try:
+                value, ok = loader()
+            except Exception as e:
+                logger.error(f"Background refresh error for {key}: {e}")
+                ok = False
+            with self.lock:
+                if ok:
+                    self.entries[key] = CacheEntry(value, ok, ttl, self.stale_ttl, self.clock())
+                else:
+                    # Keep serving the last good value until it is too stale
+                    entry.retry_at = self.clock() + self.negative_ttl
+                    entry.refreshing = False
+
+        self.executor.submit(refresh)
+
+    def prefetch(self, top_n=10, horizon=60):
+        """Refresh the most requested keys that expire within `horizon` seconds.
+
+        Request counts are halved after every cycle, so a key that was popular
+        once drops out of the prefetch set when it stops being requested.
+        """
+        soon = self.clock() + horizon
+        with self.lock:
+            for key, _ in self.popularity.most_common(top_n):
+                entry = self.entries.get(key)
+                if entry is None or entry.expires_at <= soon:
+                    if entry is None:
+                        loader, ttl = self.loaders[key]
+                        self.executor.submit(self._load, key, loader, ttl)
+                    else:
+                        self._refresh_in_background(key, entry)
+            self.popularity = Counter({key: hits // 2 for key, hits in self.popularity.items() if hits > 1})
+
+    def start_prefetch(self, interval=60, top_n=10):
+        """Run prefetch() every `interval` seconds on a background thread"""
+        self.scheduler.every(interval).seconds.do(self.prefetch, top_n=top_n, horizon=interval)
+
+        def run():
+            while True:
+                self.scheduler.run_pending()
+                time.sleep(1)
+
+        thread = threading.Thread(target=run)
+        thread.daemon = True
+        thread.start()
+
+    def warm(self, items):
+        """Load (key, loader, ttl) items in the background, e.g. default locations at startup"""
+        for key, loader, ttl in items:
+            with self.lock:
+                self.loaders[key] = (loader, ttl)
+                self.popularity[key] += 1
+            self.executor.submit(self._load, key, loader, ttl)
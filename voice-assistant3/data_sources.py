@@ -0,0 +1,45 @@
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def fetch_weather(http, url, api_key, location):
+    """Call the weather API. Returns (message, ok)"""
+    try:
+        params = {'q': location, 'appid': api_key, 'units': 'metric'}
+        response = http.get(url, params=params, timeout=10)
+        data = response.json()
+        
+        if response.status_code == 200:
+            temp = data['main']['temp']
+            description = data['weather'][0]['description']
+            humidity = data['main']['humidity']
+            return f"In {location}, it's {temp}°C with {description}. Humidity is {humidity}%.", True
+        else:
+            return f"Could not get weather for {location}. Please try again later.", False
+    except Exception as e:
+        logger.error(f"Weather API error: {e}")
+        return "Sorry, I'm having trouble accessing weather information.", False
+
+
+def fetch_news(http, url, api_key, category):
+    """Call the news API. Returns (message, ok)"""
+    try:
+        params = {'category': category, 'country': 'us', 'apiKey': api_key}
+        response = http.get(url, params=params, timeout=10)
+        data = response.json()
+        
+        if response.status_code == 200 and data['articles']:
+            articles = data['articles'][:3] 
+            news_items = []
+            for article in articles:
+                title = article['title']
+                source = article['source']['name']
+                news_items.append(f"{title} from {source}")
+            
+            return f"Here are the latest {category} news: {' '.join(news_items)}", True
+        else:
+            return f"Could not fetch {category} news at the moment.", False
+    except Exception as e:
+        logger.error(f"News API error: {e}")
+        return "Sorry, I'm having trouble accessing news.", False
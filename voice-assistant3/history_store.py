@@ -0,0 +1,161 @@
+import itertools
+import logging
+import sqlite3
+import threading
+from collections import OrderedDict, deque
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+
+class HistoryStore:
+    """Per-session conversation history in bounded ring buffers, optionally persisted to SQLite"""
+
+    def __init__(self, max_per_session=200, max_sessions=10000, db_path=None,
+                 flush_interval=2.0, batch_size=100):
+        self.max_per_session = max_per_session
+        self.max_sessions = max_sessions
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.sessions = OrderedDict()
+        self.pending = []
+        self.lock = threading.Lock()
+        self.flush_needed = threading.Event()
+        self.conn = None
+
+        next_id = 1
+        if db_path:
+            self.conn = sqlite3.connect(db_path, check_same_thread=False)
+            self.db_lock = threading.Lock()
+            next_id = self._init_db() + 1
+            flusher = threading.Thread(target=self._flush_loop)
+            flusher.daemon = True
+            flusher.start()
+        self.ids = itertools.count(next_id)
+
+    def _init_db(self):
+        """Create the table and return the highest stored entry id"""
+        with self.conn:
+            self.conn.execute(
+                """CREATE TABLE IF NOT EXISTS history (
+                    id INTEGER PRIMARY KEY,
+                    session_id TEXT NOT NULL,
+                    timestamp TEXT NOT NULL,
+                    type TEXT NOT NULL,
+                    text TEXT NOT NULL
+                )"""
+            )
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_history_session ON history (session_id, id)")
+        row = self.conn.execute("SELECT MAX(id) FROM history").fetchone()
+        return row[0] or 0
+
+    def append(self, session_id, entry_type, text):
+        """Record a user command or assistant response"""
+        key = 'command' if entry_type == 'user' else 'response'
+        with self.lock:
+            entry = {
+                'id': next(self.ids),
+                'session_id': session_id,
+                'timestamp': datetime.now(),
+                key: text,
+                'type': entry_type
+            }
+            buffer = self.sessions.get(session_id)
+            if buffer is None:
+                buffer = self.sessions[session_id] = deque(maxlen=self.max_per_session)
+                if len(self.sessions) > self.max_sessions:
+                    self.sessions.popitem(last=False)
+            else:
+                self.sessions.move_to_end(session_id)
+            buffer.append(entry)
+            if self.conn is not None:
+                self.pending.append(entry)
+                if len(self.pending) >= self.batch_size:
+                    self.flush_needed.set()
+        return entry
+
+    def page(self, session_id, before=None, limit=50):
+        """Up to `limit` entries older than the `before` cursor, oldest first.
+
+        Returns (entries, next_cursor); next_cursor is None when nothing older remains.
+        """
+        if limit < 1:
+            return [], None
+        with self.lock:
+            buffer = self.sessions.get(session_id)
+            entries = [e for e in buffer if before is None or e['id'] < before] if buffer else []
+
+        page = entries[-limit:]
+        more = len(entries) > limit
+        # Older entries may have rotated out of memory or the session may have been evicted
+        if self.conn is not None:
+            if len(page) < limit:
+                need = limit - len(page)
+                older = self._load(session_id, page[0]['id'] if page else before, need + 1)
+                more = len(older) > need
+                page = older[-need:] + page
+            elif not more:
+                more = self._has_older(session_id, page[0]['id'])
+
+        next_cursor = page[0]['id'] if page and more else None
+        return page, next_cursor
+
+    def _has_older(self, session_id, before):
+        """True when SQLite holds an entry for the session older than `before`"""
+        self.flush()
+        with self.db_lock:
+            row = self.conn.execute(
+                "SELECT 1 FROM history WHERE session_id = ? AND id < ? LIMIT 1", (session_id, before)
+            ).fetchone()
+        return row is not None
+
+    def _load(self, session_id, before, limit):
+        self.flush()
+        query = "SELECT id, session_id, timestamp, type, text FROM history WHERE session_id = ?"
+        params = [session_id]
+        if before is not None:
+            query += " AND id < ?"
+            params.append(before)
+        query += " ORDER BY id DESC LIMIT ?"
+        params.append(limit)
+        with self.db_lock:
+            rows = self.conn.execute(query, params).fetchall()
+        entries = []
+        for entry_id, sid, timestamp, entry_type, text in reversed(rows):
+            key = 'command' if entry_type == 'user' else 'response'
+            entries.append({
+                'id': entry_id,
+                'session_id': sid,
+                'timestamp': datetime.fromisoformat(timestamp),
+                key: text,
+                'type': entry_type
+            })
+        return entries
+
+    def flush(self):
+        """Write pending entries to SQLite in one transaction"""
+        if self.conn is None:
+            return
+        with self.lock:
+            batch, self.pending = self.pending, []
+        if not batch:
+            return
+        rows = [
+            (e['id'], e['session_id'], e['timestamp'].isoformat(), e['type'],
+             e.get('command', e.get('response', '')))
+            for e in batch
+        ]
+        try:
+            with self.db_lock, self.conn:
+                self.conn.executemany(
+                    "INSERT OR IGNORE INTO history (id, session_id, timestamp, type, text) VALUES (?, ?, ?, ?, ?)",
+                    rows
+                )
+        except sqlite3.Error as e:
+            logger.error(f"History flush error: {e}")
+
+    def _flush_loop(self):
+        while True:
+            self.flush_needed.wait(self.flush_interval)
+            self.flush_needed.clear()
+            self.flush()
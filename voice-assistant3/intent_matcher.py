@@ -0,0 +1,80 @@
+import re
+
+WORD_PATTERN = re.compile(r"[a-z0-9']+")
+
+
+def _words(text):
+    return tuple(WORD_PATTERN.findall(text.lower()))
+
+
+class IntentRegistry:
+    """Declarative intents and slots compiled into one word n-gram table.
+
+    match() walks the command once, taking the longest known phrase at each
+    word, so its cost depends on the command length rather than the number of
+    registered intents. Phrases only match on whole words, but a last word of
+    three or more letters also matches with a plural 's' ('movie' matches
+    'movies'); phrases registered explicitly take precedence over plurals.
+    """
+
+    def __init__(self):
+        self.table = {}
+        self.plurals = {}
+        self.priorities = {}
+        self.max_words = 1
+
+    @classmethod
+    def from_spec(cls, intents, slots=None):
+        """Build from [(intent, phrases), ...] in priority order and {slot: {value: phrases}}"""
+        registry = cls()
+        for name, phrases in intents:
+            registry.add_intent(name, phrases)
+        for slot, values in (slots or {}).items():
+            registry.add_slot(slot, values)
+        return registry
+
+    def add_intent(self, name, phrases):
+        """Register an intent; intents added earlier win when several match"""
+        self.priorities.setdefault(name, len(self.priorities))
+        for phrase in phrases:
+            self._add_phrase(phrase, ('intent', name))
+
+    def add_slot(self, slot, values):
+        """Register slot values, each with the phrases that select it"""
+        for value, phrases in values.items():
+            for phrase in phrases:
+                self._add_phrase(phrase, (slot, value))
+
+    def _add_phrase(self, phrase, target):
+        words = _words(phrase)
+        if not words:
+            return
+        self.table.setdefault(words, []).append(target)
+        if len(words[-1]) > 2:
+            plural = words[:-1] + (words[-1] + 's',)
+            self.plurals.setdefault(plural, []).append(target)
+        self.max_words = max(self.max_words, len(words))
+
+    def match(self, command):
+        """Classify a command and extract slots in one pass. Returns (intent or None, slots)"""
+        words = _words(command)
+        intent = None
+        slots = {}
+        i = 0
+        count = len(words)
+        while i < count:
+            for length in range(min(self.max_words, count - i), 0, -1):
+                phrase = words[i:i + length]
+                targets = self.table.get(phrase) or self.plurals.get(phrase)
+                if targets:
+                    for kind, value in targets:
+                        if kind == 'intent':
+                            if intent is None or self.priorities[value] < self.priorities[intent]:
+                                intent = value
+                        else:
+                            slots.setdefault(kind, value)
+                    i += length
+                    break
+            else:
+                i += 1
+        return intent, slots
@@ -0,0 +1,84 @@
+"""Local stand-in for the OpenWeather and NewsAPI endpoints.
+
+Start the assistant with
+OPENWEATHER_API_URL=http://127.0.0.1:5002/data/2.5/weather
+NEWS_API_URL=http://127.0.0.1:5002/v2/top-headlines
+"""
+import argparse
+import random
+import threading
+import time
+from flask import Flask, request, jsonify
+
+app = Flask(__name__)
+
+settings = {'latency': 0.2, 'error_rate': 0.0}
+stats = {'weather': 0, 'news': 0, 'errors': 0}
+stats_lock = threading.Lock()
+
+
+def count(key):
+    with stats_lock:
+        stats[key] += 1
+
+
+def simulate():
+    """Apply latency and return an error response when one is due"""
+    time.sleep(settings['latency'])
+    if random.random() < settings['error_rate']:
+        count('errors')
+        return jsonify({'message': 'Service unavailable'}), 503
+    return None
+
+
+@app.route('/data/2.5/weather')
+def weather():
+    count('weather')
+    error = simulate()
+    if error:
+        return error
+    location = request.args.get('q', '')
+    if location.lower() == 'nowhere':
+        return jsonify({'cod': '404', 'message': 'city not found'}), 404
+    seed = sum(map(ord, location.lower()))
+    return jsonify({
+        'name': location,
+        'main': {'temp': round(10 + seed % 20 + random.random(), 1), 'humidity': 40 + seed % 50},
+        'weather': [{'description': random.choice(['clear sky', 'light rain', 'scattered clouds'])}]
+    })
+
+
+@app.route('/v2/top-headlines')
+def top_headlines():
+    count('news')
+    error = simulate()
+    if error:
+        return error
+    category = request.args.get('category', 'general')
+    return jsonify({
+        'status': 'ok',
+        'articles': [
+            {'title': f"{category.title()} headline {i}", 'source': {'name': f"Mock Source {i}"}}
+            for i in range(1, 6)
+        ]
+    })
+
+
+@app.route('/stats')
+def get_stats():
+    with stats_lock:
+        return jsonify(dict(stats))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--port', type=int, default=5002)
+    parser.add_argument('--latency', type=float, default=0.2, help='response latency in seconds')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='fraction of requests answered with 503')
+    args = parser.parse_args()
+    settings.update(latency=args.latency, error_rate=args.error_rate)
+    app.run(host='127.0.0.1', port=args.port, threaded=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+import heapq
+import logging
+import sqlite3
+import threading
+import uuid
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+
+class ReminderScheduler:
+    """Priority-queue reminder timer backed by SQLite"""
+
+    def __init__(self, db_path, on_due):
+        self.on_due = on_due
+        self.heap = []
+        self.condition = threading.Condition()
+        self.db_lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._init_db()
+        self._load_pending()
+
+        self.thread = threading.Thread(target=self._run)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def _init_db(self):
+        with self.db_lock, self.conn:
+            self.conn.execute(
+                """CREATE TABLE IF NOT EXISTS reminders (
+                    id TEXT PRIMARY KEY,
+                    message TEXT NOT NULL,
+                    fire_at REAL NOT NULL,
+                    set_at REAL NOT NULL
+                )"""
+            )
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_reminders_fire_at ON reminders (fire_at)")
+
+    def _load_pending(self):
+        """Rebuild the heap from reminders that survived a restart"""
+        with self.db_lock:
+            rows = self.conn.execute("SELECT fire_at, id FROM reminders").fetchall()
+        self.heap = [(fire_at, reminder_id) for fire_at, reminder_id in rows]
+        heapq.heapify(self.heap)
+        logger.info(f"Loaded {len(self.heap)} pending reminders")
+
+    def add(self, message, fire_time):
+        """Schedule a reminder at a datetime and wake the timer if it is the new earliest"""
+        reminder_id = str(uuid.uuid4())
+        fire_at = fire_time.timestamp()
+        with self.db_lock, self.conn:
+            self.conn.execute(
+                "INSERT INTO reminders (id, message, fire_at, set_at) VALUES (?, ?, ?, ?)",
+                (reminder_id, message, fire_at, datetime.now().timestamp())
+            )
+        with self.condition:
+            heapq.heappush(self.heap, (fire_at, reminder_id))
+            if self.heap[0][1] == reminder_id:
+                self.condition.notify()
+        return reminder_id
+
+    def cancel(self, reminder_id):
+        """Remove a reminder; its heap entry is skipped when it comes due"""
+        with self.db_lock, self.conn:
+            cursor = self.conn.execute("DELETE FROM reminders WHERE id = ?", (reminder_id,))
+        return cursor.rowcount > 0
+
+    def pending(self, limit=100, offset=0):
+        """Upcoming reminders in due order, read through the fire_at index"""
+        with self.db_lock:
+            rows = self.conn.execute(
+                "SELECT id, message, fire_at, set_at FROM reminders ORDER BY fire_at LIMIT ? OFFSET ?",
+                (limit, offset)
+            ).fetchall()
+        return [self._row_to_reminder(row) for row in rows]
+
+    def _row_to_reminder(self, row):
+        reminder_id, message, fire_at, set_at = row
+        return {
+            'id': reminder_id,
+            'message': message,
+            'time': datetime.fromtimestamp(fire_at),
+            'set_time': datetime.fromtimestamp(set_at)
+        }
+
+    def _run(self):
+        """Sleep until the earliest reminder is due, fire it, repeat"""
+        while True:
+            with self.condition:
+                while True:
+                    now = datetime.now().timestamp()
+                    if self.heap and self.heap[0][0] <= now:
+                        break
+                    timeout = self.heap[0][0] - now if self.heap else None
+                    self.condition.wait(timeout)
+                due = []
+                while self.heap and self.heap[0][0] <= now:
+                    due.append(heapq.heappop(self.heap)[1])
+
+            for reminder_id in due:
+                self._fire(reminder_id)
+
+    def _fire(self, reminder_id):
+        """Claim a due reminder and announce it.
+
+        Another process can hold the same reminders in its heap (e.g. the
+        Werkzeug reloader parent), so only the process whose DELETE removes
+        the row announces it.
+        """
+        with self.db_lock, self.conn:
+            row = self.conn.execute(
+                "SELECT id, message, fire_at, set_at FROM reminders WHERE id = ?", (reminder_id,)
+            ).fetchone()
+            if row is None:
+                # Cancelled after it was scheduled, or already fired elsewhere
+                return
+            cursor = self.conn.execute("DELETE FROM reminders WHERE id = ?", (reminder_id,))
+        if cursor.rowcount != 1:
+            return
+        try:
+            self.on_due(self._row_to_reminder(row))
+        except Exception as e:
+            logger.error(f"Reminder callback error: {e}")
@@ -0,0 +1,164 @@
+import logging
+import secrets
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from flask.json.tag import TaggedJSONSerializer
+from flask.sessions import SessionInterface, SessionMixin
+from werkzeug.datastructures import CallbackDict
+
+logger = logging.getLogger(__name__)
+
+
+class ServerSideSession(CallbackDict, SessionMixin):
+    def __init__(self, initial=None, sid=None, new=False):
+        def on_update(self):
+            self.modified = True
+        super().__init__(initial, on_update)
+        self.sid = sid
+        self.new = new
+        self.modified = False
+
+
+class SQLiteSessionInterface(SessionInterface):
+    """Server-side sessions in one SQLite file with an in-memory LRU tier.
+
+    Sessions expire `ttl` seconds after their last use; a background sweeper
+    deletes expired rows. Unmodified sessions are only written back when their
+    expiry needs extending, so most requests do no disk I/O at all.
+    """
+
+    serializer = TaggedJSONSerializer()
+
+    def __init__(self, db_path, ttl=86400, cache_size=10000, sweep_interval=300):
+        self.ttl = ttl
+        self.cache_size = cache_size
+        self.sweep_interval = sweep_interval
+        self.cache = OrderedDict()
+        self.cache_lock = threading.Lock()
+        self.db_lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._init_db()
+
+        sweeper = threading.Thread(target=self._sweep_loop)
+        sweeper.daemon = True
+        sweeper.start()
+
+    def _init_db(self):
+        with self.db_lock, self.conn:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            self.conn.execute(
+                """CREATE TABLE IF NOT EXISTS sessions (
+                    sid TEXT PRIMARY KEY,
+                    data TEXT NOT NULL,
+                    expires REAL NOT NULL
+                )"""
+            )
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_sessions_expires ON sessions (expires)")
+
+    def open_session(self, app, request):
+        sid = request.cookies.get(self.get_cookie_name(app))
+        if sid:
+            record = self._get(sid)
+            if record is not None:
+                data, _ = record
+                return ServerSideSession(data, sid=sid)
+        return ServerSideSession(sid=secrets.token_urlsafe(32), new=True)
+
+    def save_session(self, app, session, response):
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+        name = self.get_cookie_name(app)
+
+        if not session:
+            if session.modified and not session.new:
+                self._delete(session.sid)
+                response.delete_cookie(name, domain=domain, path=path)
+            return
+
+        now = time.time()
+        expires = now + self.ttl
+        if session.new or session.modified:
+            self._put(session.sid, dict(session), expires, write=True)
+        else:
+            record = self._get(session.sid)
+            # Extend the expiry on disk at most once per half TTL
+            if record is None or record[1] - now < self.ttl / 2:
+                self._put(session.sid, dict(session), expires, write=True)
+
+        if session.new or session.modified:
+            response.set_cookie(
+                name,
+                session.sid,
+                expires=self.get_expiration_time(app, session),
+                httponly=self.get_cookie_httponly(app),
+                domain=domain,
+                path=path,
+                secure=self.get_cookie_secure(app),
+                samesite=self.get_cookie_samesite(app)
+            )
+
+    def _get(self, sid):
+        """(data, expires) for a live session, from memory first and then SQLite"""
+        now = time.time()
+        with self.cache_lock:
+            record = self.cache.get(sid)
+            if record is not None:
+                if record[1] > now:
+                    self.cache.move_to_end(sid)
+                    return record
+                del self.cache[sid]
+
+        with self.db_lock:
+            row = self.conn.execute(
+                "SELECT data, expires FROM sessions WHERE sid = ? AND expires > ?", (sid, now)
+            ).fetchone()
+        if row is None:
+            return None
+        record = (self.serializer.loads(row[0]), row[1])
+        self._cache(sid, record)
+        return record
+
+    def _put(self, sid, data, expires, write):
+        self._cache(sid, (data, expires))
+        if write:
+            with self.db_lock, self.conn:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO sessions (sid, data, expires) VALUES (?, ?, ?)",
+                    (sid, self.serializer.dumps(data), expires)
+                )
+
+    def _cache(self, sid, record):
+        with self.cache_lock:
+            self.cache[sid] = record
+            self.cache.move_to_end(sid)
+            while len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+
+    def _delete(self, sid):
+        with self.cache_lock:
+            self.cache.pop(sid, None)
+        with self.db_lock, self.conn:
+            self.conn.execute("DELETE FROM sessions WHERE sid = ?", (sid,))
+
+    def sweep(self):
+        """Delete expired sessions from SQLite and the memory tier"""
+        now = time.time()
+        with self.db_lock, self.conn:
+            deleted = self.conn.execute("DELETE FROM sessions WHERE expires <= ?", (now,)).rowcount
+        with self.cache_lock:
+            for sid in [sid for sid, (_, expires) in self.cache.items() if expires <= now]:
+                del self.cache[sid]
+        if deleted:
+            logger.info(f"Swept {deleted} expired sessions")
+        return deleted
+
+    def _sweep_loop(self):
+        while True:
+            time.sleep(self.sweep_interval)
+            try:
+                self.sweep()
+            except sqlite3.Error as e:
+                logger.error(f"Session sweep error: {e}")
@@ -87,7 +87,7 @@ class VoiceAssistant {
         avatar.classList.add(state);
     }
 
-    addMessage(sender, text) {
+    addMessage(sender, text, speak = true) {
         const conversation = document.getElementById('conversation');
         const messageDiv = document.createElement('div');
         messageDiv.className = `message ${sender.toLowerCase()}-message`;
@@ -101,7 +101,7 @@ class VoiceAssistant {
         conversation.scrollTop = conversation.scrollHeight;
 
         // If it's an assistant message, also speak it
-        if (sender === 'Assistant') {
+        if (sender === 'Assistant' && speak) {
             this.speak(text);
         }
     }
@@ -110,16 +110,17 @@ class VoiceAssistant {
         this.addMessage('You', command);
         
         try {
-            const response = await fetch('/process', {
+            // The pipeline speaks the response itself, saving a separate /speak call
+            const response = await fetch('/pipeline', {
                 method: 'POST',
                 headers: {
                     'Content-Type': 'application/json',
                 },
-                body: JSON.stringify({ command: command })
+                body: JSON.stringify({ commands: [command], speak: true })
             });
             
             const data = await response.json();
-            this.addMessage('Assistant', data.response);
+            data.results.forEach(result => this.addMessage('Assistant', result.response, false));
         } catch (error) {
             console.error('Error:', error);
             this.addMessage('Assistant', 'Sorry, I encountered an error processing your request.');
@@ -0,0 +1,221 @@
+"""TTLCache behaviour against an in-process fake loader and the local stand-in API.
+
+Run from voice-assistant3/: python -m pytest tests
+"""
+import os
+import sys
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_cache import TTLCache, create_http_session
+from data_sources import fetch_news, fetch_weather
+
+
+class FakeClock:
+    """Manually advanced time source, so expiry never depends on the machine's speed"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+class FakeLoader:
+    """Stand-in for an upstream API; counts calls and can be switched to failing"""
+
+    def __init__(self, value='sunny'):
+        self.value = value
+        self.ok = True
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def __call__(self):
+        with self.lock:
+            self.calls += 1
+            if not self.ok:
+                return {'error': 'Service unavailable'}, False
+            return f"{self.value} {self.calls}", True
+
+
+def make_cache(clock, **kwargs):
+    # One worker runs background loads in submission order, which drain() relies on
+    return TTLCache(workers=1, clock=clock, **kwargs)
+
+
+def drain(cache):
+    """Wait for every background load submitted so far"""
+    cache.executor.submit(lambda: None).result(timeout=5)
+
+
+def test_fresh_hit_does_not_call_loader():
+    clock = FakeClock()
+    cache = make_cache(clock)
+    loader = FakeLoader()
+
+    assert cache.get('weather:London', loader, ttl=60) == 'sunny 1'
+    clock.advance(59)
+    assert cache.get('weather:London', loader, ttl=60) == 'sunny 1'
+    assert loader.calls == 1
+
+
+def test_stale_value_served_with_one_background_refresh():
+    clock = FakeClock()
+    cache = make_cache(clock, stale_ttl=60)
+    loader = FakeLoader()
+    cache.get('weather:London', loader, ttl=10)
+    clock.advance(11)
+
+    # Hold the only worker so every get() sees the refresh still in flight
+    gate = threading.Event()
+    cache.executor.submit(gate.wait)
+    values = [cache.get('weather:London', loader, ttl=10) for _ in range(20)]
+    gate.set()
+    drain(cache)
+
+    assert values == ['sunny 1'] * 20
+    assert loader.calls == 2
+    assert cache.get('weather:London', loader, ttl=10) == 'sunny 2'
+
+
+def test_failed_refresh_backs_off_for_negative_ttl():
+    clock = FakeClock()
+    cache = make_cache(clock, stale_ttl=60, negative_ttl=20)
+    loader = FakeLoader()
+    cache.get('weather:London', loader, ttl=10)
+    clock.advance(11)
+    loader.ok = False
+
+    assert cache.get('weather:London', loader, ttl=10) == 'sunny 1'
+    drain(cache)
+    clock.advance(19)
+    values = [cache.get('weather:London', loader, ttl=10) for _ in range(20)]
+    drain(cache)
+
+    assert values == ['sunny 1'] * 20
+    assert loader.calls == 2
+
+    clock.advance(1)
+    loader.ok = True
+    cache.get('weather:London', loader, ttl=10)
+    drain(cache)
+    assert loader.calls == 3
+    assert cache.get('weather:London', loader, ttl=10) == 'sunny 3'
+
+
+def test_negative_entry_expires_after_negative_ttl():
+    clock = FakeClock()
+    cache = make_cache(clock, negative_ttl=30)
+    loader = FakeLoader()
+    loader.ok = False
+
+    assert cache.get('weather:Nowhere', loader, ttl=600) == {'error': 'Service unavailable'}
+    clock.advance(29)
+    cache.get('weather:Nowhere', loader, ttl=600)
+    assert loader.calls == 1
+
+    clock.advance(1)
+    loader.ok = True
+    assert cache.get('weather:Nowhere', loader, ttl=600) == 'sunny 2'
+    assert loader.calls == 2
+
+
+def test_prefetch_refreshes_only_top_keys():
+    clock = FakeClock()
+    cache = make_cache(clock, stale_ttl=60)
+    loaders = {key: FakeLoader(key) for key in ('London', 'Paris', 'Tokyo')}
+    for key, hits in (('London', 3), ('Paris', 2), ('Tokyo', 1)):
+        for _ in range(hits):
+            cache.get(key, loaders[key], ttl=30)
+
+    cache.prefetch(top_n=2, horizon=60)
+    drain(cache)
+
+    assert loaders['London'].calls == 2
+    assert loaders['Paris'].calls == 2
+    assert loaders['Tokyo'].calls == 1
+    assert cache.get('London', loaders['London'], ttl=30) == 'London 2'
+
+
+def test_prefetch_popularity_decays():
+    clock = FakeClock()
+    cache = make_cache(clock, stale_ttl=60)
+    loader = FakeLoader('London')
+    for _ in range(8):
+        cache.get('London', loader, ttl=30)
+
+    # Counts halve each cycle: 8 -> 4 -> 2 -> 1, then the key drops out
+    for _ in range(3):
+        cache.prefetch(top_n=1, horizon=60)
+    assert 'London' in cache.popularity
+    cache.prefetch(top_n=1, horizon=60)
+    drain(cache)
+    assert 'London' not in cache.popularity
+
+
+@pytest.fixture
+def mock_api():
+    """mock_data_api served on a free local port for the duration of a test"""
+    pytest.importorskip('flask')
+    from werkzeug.serving import make_server
+    import mock_data_api
+
+    mock_data_api.settings.update(latency=0, error_rate=0.0)
+    with mock_data_api.stats_lock:
+        mock_data_api.stats.update(weather=0, news=0, errors=0)
+    server = make_server('127.0.0.1', 0, mock_data_api.app, threaded=True)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}", mock_data_api.stats
+    server.shutdown()
+
+
+def test_weather_through_pooled_session_and_cache(mock_api):
+    base_url, stats = mock_api
+    clock = FakeClock()
+    cache = make_cache(clock)
+    http = create_http_session()
+    url = f"{base_url}/data/2.5/weather"
+
+    def get(location):
+        return cache.get(('weather', location), lambda: fetch_weather(http, url, 'key', location), 600)
+
+    assert get('London').startswith("In London, it's ")
+    assert get('London').startswith("In London, it's ")
+    assert stats['weather'] == 1
+
+
+def test_unknown_city_is_negatively_cached(mock_api):
+    base_url, stats = mock_api
+    clock = FakeClock()
+    cache = make_cache(clock, negative_ttl=30)
+    http = create_http_session()
+    url = f"{base_url}/data/2.5/weather"
+
+    def get():
+        return cache.get(('weather', 'nowhere'), lambda: fetch_weather(http, url, 'key', 'nowhere'), 600)
+
+    assert get() == "Could not get weather for nowhere. Please try again later."
+    clock.advance(29)
+    get()
+    assert stats['weather'] == 1
+
+    clock.advance(1)
+    get()
+    assert stats['weather'] == 2
+
+
+def test_news_through_stand_in(mock_api):
+    base_url, stats = mock_api
+    message, ok = fetch_news(create_http_session(), f"{base_url}/v2/top-headlines", 'key', 'sports')
+
+    assert ok
+    assert message.startswith("Here are the latest sports news: Sports headline 1 from Mock Source 1")
+    assert stats['news'] == 1